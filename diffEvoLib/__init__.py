@@ -5,11 +5,22 @@ from diffEvoLib.diffEvoAlgs.novel_modified import NovelModified
 from diffEvoLib.diffEvoAlgs.adaptive_params import AdaptiveParams
 from diffEvoLib.diffEvoAlgs.emde import EmDe
 from diffEvoLib.diffEvoAlgs.scaling_params import ScalingParams
+from diffEvoLib.diffEvoAlgs.island_model import IslandModel
+from diffEvoLib.diffEvoAlgs.batched_default import BatchedDefault
 
 from diffEvoLib.diffEvoAlgs.data.alg_data import DefaultAlgData, BestWorstData, RandomLocationsData, NovelModifiedData,\
-    AdaptiveParamsData, EmDeData, ScalingParamsData
+    AdaptiveParamsData, EmDeData, ScalingParamsData, BatchedDefaultData
 
 from diffEvoLib.models.enums.optimization import OptimizationType
 from diffEvoLib.models.enums.boundary_constrain import BoundaryFixing
+from diffEvoLib.models.enums.crossover import CrossoverType
+from diffEvoLib.models.enums.migration_topology import MigrationTopology
+from diffEvoLib.models.enums.kernel_backend import KernelBackend
 
-from diffEvoLib.models.fitness_function import FitnessFunctionBase, FitnessFunction, FitnessFunctionOpfunu
+from diffEvoLib.models.fitness_function import FitnessFunctionBase, FitnessFunction, FitnessFunctionOpfunu, \
+    AsyncFitnessFunction, RemoteFitnessFunction, SubprocessFitnessFunction, RowEvaluationError
+
+from diffEvoLib.evaluators.serial import SerialEvaluator
+from diffEvoLib.evaluators.thread_pool import ThreadPoolEvaluator
+from diffEvoLib.evaluators.process_pool import ProcessPoolEvaluator
+from diffEvoLib.evaluators.auto import AutoEvaluator
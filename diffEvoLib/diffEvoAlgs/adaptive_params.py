@@ -1,8 +1,10 @@
-import numpy as np
 
 from diffEvoLib.diffEvoAlgs.base import BaseDiffEvoAlg
 from diffEvoLib.diffEvoAlgs.data.alg_data import AdaptiveParamsData
-from diffEvoLib.diffEvoAlgs.methods.methods_adaptive_params import ad_mutation, ad_binomial_crossing, ad_selection
+from diffEvoLib.diffEvoAlgs.methods.methods_adaptive_params import ad_mutation, ad_selection
+from diffEvoLib.diffEvoAlgs.methods.methods_default import crossing
+from diffEvoLib.diffEvoAlgs.methods.methods_jit import get_kernel_fun
+from diffEvoLib.evaluators.base import BaseEvaluator
 from diffEvoLib.models.enums.boundary_constrain import fix_boundary_constraints
 
 
@@ -11,38 +13,38 @@ class AdaptiveParams(BaseDiffEvoAlg):
     Source: https://ieeexplore.ieee.org/abstract/document/4730987
     """
 
-    def __init__(self, params: AdaptiveParamsData, db_conn=None, db_auto_write=False):
-        super().__init__(AdaptiveParams.__name__, params, db_conn, db_auto_write)
+    def __init__(self, params: AdaptiveParamsData, db_conn=None, db_auto_write=False, evaluator: BaseEvaluator = None):
+        super().__init__(AdaptiveParams.__name__, params, db_conn, db_auto_write, evaluator)
+
+        # Operators of the kernel backend
+        self._crossing = get_kernel_fun(crossing, self.kernel_backend)
 
         # class specific
-        self._f_arr = np.random.uniform(size=self.population_size)
-        self._cr_arr = np.random.uniform(size=self.population_size)
+        self._f_arr = self._rng.uniform(size=self.population_size)
+        self._cr_arr = self._rng.uniform(size=self.population_size)
         self.prob_f = params.prob_f
         self.prob_cr = params.prob_cr
 
-    def next_epoch(self):
-        f_arr, cr_arr, prob_f, prob_cr = (self._f_arr, self._cr_arr, self.prob_f, self.prob_cr)
-
+    def prepare_epoch(self):
         # New population after mutation
-        v_pop = ad_mutation(self._pop, f_arr)
+        v_pop = ad_mutation(self._pop, self._f_arr, rng=self._rng)
 
         # Apply boundary constrains on population in place
-        fix_boundary_constraints(v_pop, self.boundary_constraints_fun)
+        fix_boundary_constraints(v_pop, self.boundary_constraints_fun, self._pop, rng=self._rng)
 
-        # New population after crossing
-        u_pop = ad_binomial_crossing(self._pop, v_pop, cr_arr)
+        # Crossing in place, trials are written over the mutants
+        u_pop = self._crossing(self._pop, v_pop, self._cr_arr, self.crossover_type, rng=self._rng, out=v_pop)
 
-        # Update values before selection
-        u_pop.update_fitness_values(self._function.eval)
+        return u_pop
 
-        # Select new population
-        new_pop, f_arr, cr_arr = ad_selection(self._pop, u_pop, f_arr, cr_arr, prob_f, prob_cr)
+    def finish_epoch(self, u_pop):
+        f_arr, cr_arr, prob_f, prob_cr = (self._f_arr, self._cr_arr, self.prob_f, self.prob_cr)
+
+        # Select new population in place
+        _, f_arr, cr_arr = ad_selection(self._pop, u_pop, f_arr, cr_arr, prob_f, prob_cr, rng=self._rng)
 
         # Override data
-        self._pop = new_pop
         self._f_arr = f_arr
         self._cr_arr = cr_arr
         self.prob_f = prob_f
         self.prob_cr = prob_cr
-
-        self._epoch_number += 1
@@ -1,24 +1,40 @@
-import copy
+import asyncio
+import concurrent.futures
 import time
+import numpy as np
 from abc import ABC, abstractmethod
 from tqdm import tqdm
 
 from diffEvoLib.database.database_connector import SQLiteConnector
 from diffEvoLib.diffEvoAlgs.data.alg_data import BaseData
+from diffEvoLib.diffEvoAlgs.methods.methods_default import selection
+from diffEvoLib.diffEvoAlgs.methods.methods_jit import resolve_kernel_backend
+from diffEvoLib.evaluators.base import BaseEvaluator
+from diffEvoLib.evaluators.thread_pool import ThreadPoolEvaluator
 from diffEvoLib.helpers.database_helper import get_table_name, format_individuals
 from diffEvoLib.helpers.metric_helper import MetricHelper
 from diffEvoLib.models.fitness_function import FitnessFunctionBase
 from diffEvoLib.models.population import Population
 
 
-class BaseDiffEvoAlg(ABC):
-    def __init__(self, name, params: BaseData, db_conn=None, db_auto_write=False):
+class BaseDiffEvoEngine(ABC):
+    """
+    Base of the algorithms (`BaseDiffEvoAlg`) and of `BatchedDefault`: their parameters, evaluator, random
+    generator and the run loop, which records the metrics of every epoch and the run metadata.
+    """
+    # Whether the memory use stays bounded with `storage_dir` and `chunk_size` of the params
+    supports_chunked_storage = False
+
+    def __init__(self, name, params: BaseData, evaluator: BaseEvaluator = None):
+        if not self.supports_chunked_storage and (params.storage_dir is not None or params.chunk_size is not None):
+            raise ValueError(f"{name} does not support storage_dir and chunk_size.")
+
         self.name = name
         self._epoch_number = 0
         self._is_initialized = False
 
-        self._origin_pop = None
-        self._pop = None
+        # Details of the run, e.g. the evaluation backend in use
+        self.run_metadata = {}
 
         self.num_of_epochs = params.num_of_epochs
         self.population_size = params.population_size
@@ -26,57 +42,356 @@ class BaseDiffEvoAlg(ABC):
         self.interval = [params.interval_lower_bound, params.interval_higher_bound]
         self.mode = params.mode
         self.boundary_constraints_fun = params.boundary_constraints_fun
+        self.crossover_type = params.crossover_type
+        self.penalty_fitness = params.penalty_fitness
+
+        # Evaluator created here is owned by the algorithm and shut down by `close`,
+        # a passed one may be shared with other runs and is left to its owner
+        self._evaluator = ThreadPoolEvaluator() if evaluator is None else evaluator
+        self._owns_evaluator = evaluator is None
+        self._failures_at_start = {}
+        self._rng = np.random.default_rng(params.seed)
+
+    @abstractmethod
+    def initialize(self):
+        pass
+
+    @abstractmethod
+    def next_epoch(self):
+        pass
+
+    @abstractmethod
+    def calculate_metrics(self, start_time, epoch):
+        """
+        :return: Metrics of the current population, recorded after every epoch.
+        """
+        pass
+
+    def get_run_label(self):
+        """
+        :return: Description of the solved problem printed at the end of the run.
+        """
+        return f"Algorithm: {self.name}"
+
+    def run(self):
+        if not self._is_initialized:
+            print(f"{self.name} diff evo not initialized.")
+            return
+
+        # Calculate metrics
+        epoch_metrics = []
+        epoch_metric = self.calculate_metrics(0.0, epoch=-1)
+        epoch_metrics.append(epoch_metric)
+
+        start_time = time.time()
+        for epoch in tqdm(range(self.num_of_epochs), desc=f"{self.name}", unit="epoch"):
+            self.next_epoch()
+
+            # Calculate metrics
+            epoch_metric = self.calculate_metrics(start_time, epoch=epoch)
+            epoch_metrics.append(epoch_metric)
+
+        return self._finish_run(epoch_metrics, start_time)
+
+    def _start_evaluator(self, fitness_fun: FitnessFunctionBase = None):
+        # Start the evaluator workers once, they are reused by all epochs
+        self._evaluator.start(fitness_fun)
+        # Failures of a shared evaluator before this run are not counted
+        self._failures_at_start = self._evaluator.failure_counts()
+
+    def _finish_run(self, epoch_metrics, start_time):
+        end_time = time.time()
+        execution_time = end_time - start_time
+        self.run_metadata["execution_time"] = execution_time
+        # Described again, so worker utilization covers the whole run
+        self.run_metadata["evaluator"] = self._evaluator.describe()
+        self.run_metadata["evaluation_failures"] = self.get_evaluation_failures()
+        print(f'{self.get_run_label()}, Dimension: {self.nr_of_args},'
+              f' Execution time: {execution_time} seconds')
+        return epoch_metrics
+
+    def get_evaluation_failures(self):
+        """
+        :return: Number of evaluations of this run which raised, timed out or crashed their worker.
+                 Members whose evaluation failed got the penalty fitness.
+        """
+        failure_counts = self._evaluator.failure_counts()
+        return {kind: count - self._failures_at_start.get(kind, 0) for kind, count in failure_counts.items()}
+
+    def close(self):
+        if self._owns_evaluator:
+            self._evaluator.shutdown()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+
+class BaseDiffEvoAlg(BaseDiffEvoEngine):
+    # Whether the algorithm implements `generate_trials`, used by `run_steady_state`
+    supports_steady_state = False
+
+    def __init__(self, name, params: BaseData, db_conn=None, db_auto_write=False, evaluator: BaseEvaluator = None):
+        super().__init__(name, params, evaluator)
+
+        self._pop = None
+
+        # Buffers reused by every epoch, allocated by `get_trial_buffers`
+        self._trial_pop = None
+        self._work_values = None
+        self._mask = None
+
+        self.kernel_backend = resolve_kernel_backend(params.kernel_backend, name)
+        self.storage_dir = params.storage_dir
+        self.chunk_size = params.chunk_size
 
         self._function: FitnessFunctionBase = params.function
 
         self._database = SQLiteConnector(db_conn) if db_conn is not None else None
         self.db_auto_write = db_auto_write
 
-    @abstractmethod
+    def prepare_epoch(self):
+        """
+        Creates the trial population of the epoch. Algorithms either implement it (and `finish_epoch` when they
+        don't use the greedy selection) or override `next_epoch` directly.
+
+        :return: Population of trials, which is evaluated before `finish_epoch`.
+        """
+        raise NotImplementedError(f"{self.name} implements neither prepare_epoch nor next_epoch.")
+
+    def finish_epoch(self, u_pop: Population):
+        """
+        Selects the new population from the evaluated trials and updates the algorithm parameters.
+        By default the trials replace their targets when they are better.
+        """
+        selection(self._pop, u_pop)
+
     def next_epoch(self):
-        pass
+        u_pop = self.prepare_epoch()
+
+        # Update values before selection
+        u_pop.update_fitness_values(self._function, self._evaluator, self.penalty_fitness)
+
+        self.finish_epoch(u_pop)
+        self._epoch_number += 1
+
+    async def next_epoch_async(self):
+        """
+        Coroutine version of `next_epoch`, the trials are evaluated with `BaseEvaluator.evaluate_async`.
+        Algorithms overriding only `next_epoch` run it in a thread, so the event loop is not blocked.
+        """
+        if type(self).prepare_epoch is BaseDiffEvoAlg.prepare_epoch:
+            await asyncio.get_running_loop().run_in_executor(None, self.next_epoch)
+            return
+
+        u_pop = self.prepare_epoch()
+
+        # Update values before selection
+        await u_pop.update_fitness_values_async(self._function, self._evaluator, self.penalty_fitness)
+
+        self.finish_epoch(u_pop)
+        self._epoch_number += 1
+
+    def generate_trials(self, indices):
+        """
+        Creates trial members for the members at `indices` of the current population, used by `run_steady_state`.
+
+        :return: Population with the trial of member `indices[j]` in row j, not evaluated yet.
+        """
+        raise NotImplementedError(f"{self.name} does not support the steady-state mode.")
+
+    def get_migrants(self, nr_of_migrants):
+        """
+        :return: Copies of the real values and fitness values of the best `nr_of_migrants` members,
+                 sent to other islands by `IslandModel`.
+        """
+        indices = self._pop.get_ranked_indices()[:nr_of_migrants]
+        return self._pop.real_values[indices].copy(), self._pop.fitness_values[indices].copy()
+
+    def accept_migrants(self, real_values, fitness_values):
+        """
+        Replaces the worst members of the current population with evaluated migrants, in place.
+        Algorithm parameters kept per member (e.g. by NovelModified) stay with the replaced rows.
+        """
+        nr_of_migrants = min(len(real_values), self.population_size)
+        indices = self._pop.get_ranked_indices()[self.population_size - nr_of_migrants:]
+        self._pop.real_values[indices] = real_values[:nr_of_migrants]
+        self._pop.fitness_values[indices] = fitness_values[:nr_of_migrants]
+
+    def calculate_metrics(self, start_time, epoch):
+        return MetricHelper.calculate_metrics(self._pop, start_time, epoch=epoch)
+
+    def get_run_label(self):
+        return f"Function: {self._function.name}"
 
     def initialize(self):
         if self._is_initialized:
             print(f"{self.name} diff evo already initialized.")
             return
 
+        population = self._create_initial_population()
+        population.update_fitness_values(self._function, self._evaluator, self.penalty_fitness)
+        self._set_initial_population(population)
+
+    async def initialize_async(self):
+        """
+        Coroutine version of `initialize`, the population is evaluated with `BaseEvaluator.evaluate_async`.
+        """
+        if self._is_initialized:
+            print(f"{self.name} diff evo already initialized.")
+            return
+
+        population = self._create_initial_population()
+        await population.update_fitness_values_async(self._function, self._evaluator, self.penalty_fitness)
+        self._set_initial_population(population)
+
+    def _create_initial_population(self):
         population = Population(
             interval=self.interval,
             arg_num=self.nr_of_args,
             size=self.population_size,
-            optimization=self.mode
+            optimization=self.mode,
+            storage_dir=self.storage_dir,
+            chunk_size=self.chunk_size
         )
-        population.generate_population()
-        population.update_fitness_values(self._function.eval)
+        population.generate_population(rng=self._rng)
+
+        self._start_evaluator(self._function)
+        return population
+
+    def _set_initial_population(self, population: Population):
+        self.run_metadata["evaluator"] = self._evaluator.describe()
 
-        self._origin_pop = population
-        self._pop = copy.deepcopy(population)
+        self._pop = population
 
         self._is_initialized = True
 
-    def run(self):
+    def get_trial_buffers(self):
+        """
+        :return: The trial population and the scratch matrices of `fused_trials`, allocated on first use and
+                 reused by every epoch.
+        """
+        if self._trial_pop is None:
+            self._trial_pop = Population(
+                interval=self.interval,
+                arg_num=self.nr_of_args,
+                size=self.population_size,
+                optimization=self.mode,
+                storage_dir=self.storage_dir,
+                chunk_size=self.chunk_size
+            )
+
+            # Scratch buffers hold a chunk of rows
+            chunk_shape = (self._trial_pop.row_chunks()[0].stop, self.nr_of_args)
+            self._work_values = np.empty(chunk_shape)
+            self._mask = np.empty(chunk_shape, dtype=bool)
+        return self._trial_pop, self._work_values, self._mask
+
+    async def run_async(self):
+        """
+        Coroutine version of `run`, so evaluations of async fitness functions overlap on the running event loop
+        instead of needing a thread each.
+        """
         if not self._is_initialized:
             print(f"{self.name} diff evo not initialized.")
             return
 
         # Calculate metrics
         epoch_metrics = []
-        epoch_metric = MetricHelper.calculate_metrics(self._pop, 0.0, epoch=-1)
+        epoch_metric = self.calculate_metrics(0.0, epoch=-1)
         epoch_metrics.append(epoch_metric)
 
         start_time = time.time()
         for epoch in tqdm(range(self.num_of_epochs), desc=f"{self.name}", unit="epoch"):
-            self.next_epoch()
+            await self.next_epoch_async()
 
             # Calculate metrics
-            epoch_metric = MetricHelper.calculate_metrics(self._pop, start_time, epoch=epoch)
+            epoch_metric = self.calculate_metrics(start_time, epoch=epoch)
             epoch_metrics.append(epoch_metric)
 
-        end_time = time.time()
-        execution_time = end_time - start_time
-        print(f'Function: {self._function.name}, Dimension: {self.nr_of_args},'
-              f' Execution time: {execution_time} seconds')
+        return self._finish_run(epoch_metrics, start_time)
+
+    def run_steady_state(self, nr_of_pending=None):
+        """
+        Asynchronous steady-state variant of `run`. Instead of waiting for a whole generation, a new trial is
+        generated and submitted to the evaluator as soon as one finishes, and the finished trial is selected
+        against its target right away, so workers don't sit idle when evaluation times vary.
+
+        Every member has at most one trial in evaluation at a time. The run uses the evaluation budget of `run`
+        (num_of_epochs * population_size) and records metrics after every population_size evaluations.
+
+        :param nr_of_pending: Number of trials in evaluation at the same time, by default the number of workers
+                              of the evaluator (at most the population size).
+        :return: Metrics like the ones of `run`.
+        """
+        if not self.supports_steady_state:
+            raise ValueError(f"{self.name} does not support the steady-state mode.")
+
+        if not self._is_initialized:
+            print(f"{self.name} diff evo not initialized.")
+            return
+
+        size = self.population_size
+        nr_of_evaluations = self.num_of_epochs * size
+        nr_of_pending = self._evaluator.nr_of_workers if nr_of_pending is None else nr_of_pending
+        nr_of_pending = max(min(nr_of_pending, size), 1)
+
+        # Calculate metrics
+        epoch_metrics = []
+        epoch_metric = self.calculate_metrics(0.0, epoch=-1)
+        epoch_metrics.append(epoch_metric)
+
+        # Trials in evaluation, by future: (target index, trial population)
+        pending = {}
+        pending_targets = set()
+        next_target = 0
+        nr_of_submitted, nr_of_completed = 0, 0
+
+        start_time = time.time()
+        progress_bar = tqdm(total=self.num_of_epochs, desc=f"{self.name}", unit="epoch")
+        while nr_of_completed < nr_of_evaluations:
+            # Keep the workers busy, targets are visited in turn skipping the ones in evaluation
+            while len(pending) < nr_of_pending and nr_of_submitted < nr_of_evaluations:
+                while next_target in pending_targets:
+                    next_target = (next_target + 1) % size
+
+                trial = self.generate_trials([next_target])
+                pending[self._evaluator.submit(self._function, trial.real_values)] = (next_target, trial)
+                pending_targets.add(next_target)
+                next_target = (next_target + 1) % size
+                nr_of_submitted += 1
+
+            done, _ = concurrent.futures.wait(pending, return_when=concurrent.futures.FIRST_COMPLETED)
+            for future in done:
+                target, trial = pending.pop(future)
+                pending_targets.remove(target)
+
+                try:
+                    fitness_values = future.result()
+                except Exception:
+                    # The evaluation couldn't run (e.g. its worker crashed), evaluated again with failures isolated
+                    fitness_values = self._evaluator.evaluate(self._function, trial.real_values)
+                trial.set_fitness_values(fitness_values, self.penalty_fitness)
+
+                # Select the target or its trial in place
+                selection(self._pop, trial, [target])
+
+                nr_of_completed += 1
+                if nr_of_completed % size == 0:
+                    # Calculate metrics
+                    epoch = nr_of_completed // size - 1
+                    epoch_metric = self.calculate_metrics(start_time, epoch=epoch)
+                    epoch_metrics.append(epoch_metric)
+                    self._epoch_number += 1
+                    progress_bar.update()
+        progress_bar.close()
+
+        return self._finish_run(epoch_metrics, start_time)
+
+    def _finish_run(self, epoch_metrics, start_time):
+        epoch_metrics = super()._finish_run(epoch_metrics, start_time)
 
         if self._database is not None and self.db_auto_write:
             self.write_results_to_database(epoch_metrics)
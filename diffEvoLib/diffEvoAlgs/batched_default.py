@@ -0,0 +1,153 @@
+import time
+import numpy as np
+
+from diffEvoLib.diffEvoAlgs.base import BaseDiffEvoEngine
+from diffEvoLib.diffEvoAlgs.data.alg_data import BatchedDefaultData
+from diffEvoLib.diffEvoAlgs.methods.methods_batched import batched_mutation, batched_fix_boundary_constraints, \
+    batched_crossing, batched_selection
+from diffEvoLib.evaluators.base import BaseEvaluator
+from diffEvoLib.helpers.metric_helper import Metric, MetricHelper
+from diffEvoLib.models.enums.kernel_backend import KernelBackend
+from diffEvoLib.models.enums.optimization import get_worst_fitness
+from diffEvoLib.models.fitness_function import FitnessFunctionBase
+from diffEvoLib.models.member import Member
+
+
+class BatchedDefault(BaseDiffEvoEngine):
+    """
+    The `Default` algorithm for P independent problems evolved at once. Populations are kept in a (P, N, D)
+    tensor and fitness values in a (P, N) matrix, so mutation, boundary fixing, crossover and selection are
+    single vectorized operations over all problems instead of P Python loops. Problems can have their own
+    mutation factor, crossover rate and fitness function (e.g. shifted variants of a benchmark), all of them
+    share the number of members, the dimension, the bounds and the optimization type.
+
+    With a single fitness function all trials of an epoch are evaluated by one evaluator call, with one
+    function per problem every problem is evaluated by its own call (the process pool restarts its workers for
+    each different function, so it suits the single function case).
+
+    Populations are kept in memory and evolved with the NumPy operators, so `kernel_backend`, `storage_dir`
+    and `chunk_size` of the params are not supported.
+    """
+
+    def __init__(self, params: BatchedDefaultData, evaluator: BaseEvaluator = None):
+        if params.kernel_backend != KernelBackend.NUMPY:
+            raise ValueError(f"{BatchedDefault.__name__} only supports the NUMPY kernel backend.")
+
+        super().__init__(BatchedDefault.__name__, params, evaluator)
+        self.nr_of_problems = params.nr_of_problems
+
+        shape = (self.nr_of_problems,)
+        self.mutation_factors = np.broadcast_to(np.asarray(params.mutation_factor, dtype=float), shape).copy()
+        self.crossover_rates = np.broadcast_to(np.asarray(params.crossover_rate, dtype=float), shape).copy()
+
+        if isinstance(params.function, FitnessFunctionBase):
+            self._functions = [params.function]
+        else:
+            self._functions = list(params.function)
+            if len(self._functions) != self.nr_of_problems:
+                raise ValueError("Expected a single fitness function or one function per problem.")
+
+        self._lower_bounds = np.broadcast_to(np.asarray(self.interval[0], dtype=float), (self.nr_of_args,))
+        self._upper_bounds = np.broadcast_to(np.asarray(self.interval[1], dtype=float), (self.nr_of_args,))
+
+        # (P, N, D) populations and (P, N) fitness values
+        self.real_values = None
+        self.fitness_values = None
+
+    def evaluate(self, real_values):
+        """
+        :param real_values: The (P, N, D) tensor of members.
+        :return: The (P, N) matrix of fitness values, failed evaluations get the penalty fitness.
+        """
+        if len(self._functions) == 1:
+            rows = real_values.reshape(-1, self.nr_of_args)
+            fitness_values = self._evaluator.evaluate(self._functions[0], rows).reshape(real_values.shape[:2])
+        else:
+            fitness_values = np.empty(real_values.shape[:2])
+            for problem, fitness_fun in enumerate(self._functions):
+                fitness_values[problem] = self._evaluator.evaluate(fitness_fun, real_values[problem])
+
+        penalty_fitness = get_worst_fitness(self.mode) if self.penalty_fitness is None else self.penalty_fitness
+        fitness_values[np.isnan(fitness_values)] = penalty_fitness
+        return fitness_values
+
+    def initialize(self):
+        if self._is_initialized:
+            print(f"{self.name} diff evo already initialized.")
+            return
+
+        shape = (self.nr_of_problems, self.population_size, self.nr_of_args)
+        self.real_values = self._rng.uniform(self._lower_bounds, self._upper_bounds, size=shape)
+
+        # Workers can be prepared only for a single function
+        self._start_evaluator(self._functions[0] if len(self._functions) == 1 else None)
+        self.fitness_values = self.evaluate(self.real_values)
+        self.run_metadata["evaluator"] = self._evaluator.describe()
+
+        self._is_initialized = True
+
+    def prepare_epoch(self):
+        # New populations after mutation
+        v_values = batched_mutation(self.real_values, self.mutation_factors, rng=self._rng)
+
+        # Apply boundary constrains on populations in place
+        batched_fix_boundary_constraints(v_values, self._lower_bounds, self._upper_bounds,
+                                         self.boundary_constraints_fun, self.real_values, rng=self._rng)
+
+        # New populations after crossing
+        return batched_crossing(self.real_values, v_values, self.crossover_rates, self.crossover_type, rng=self._rng)
+
+    def finish_epoch(self, u_values, u_fitness_values):
+        # Select new populations in place
+        batched_selection(self.real_values, self.fitness_values, u_values, u_fitness_values, self.mode)
+
+    def next_epoch(self):
+        u_values = self.prepare_epoch()
+        self.finish_epoch(u_values, self.evaluate(u_values))
+        self._epoch_number += 1
+
+    def calculate_metrics(self, start_time, epoch):
+        """
+        :return: Metric of every problem, like the ones of `MetricHelper.calculate_metrics`.
+        """
+        problems = np.arange(self.nr_of_problems)
+        best_indices, worst_indices = MetricHelper.get_best_worst_indices(self.fitness_values, self.mode, axis=1)
+
+        # Members own copies, the tensors change in the next epoch
+        best_values = self.real_values[problems, best_indices]
+        worst_values = self.real_values[problems, worst_indices]
+        best_fitness_values = self.fitness_values[problems, best_indices].reshape(-1, 1)
+        worst_fitness_values = self.fitness_values[problems, worst_indices].reshape(-1, 1)
+
+        pop_means = np.mean(self.fitness_values, axis=1)
+        pop_stds = np.std(self.fitness_values, axis=1)
+        execution_time = time.time() - start_time
+
+        return [
+            Metric(
+                epoch=epoch + 1,
+                best_individual=Member(self.interval, self.nr_of_args, best_values[problem],
+                                       best_fitness_values[problem]),
+                worst_individual=Member(self.interval, self.nr_of_args, worst_values[problem],
+                                        worst_fitness_values[problem]),
+                population_mean=pop_means[problem],
+                population_std=pop_stds[problem],
+                execution_time=execution_time
+            )
+            for problem in problems
+        ]
+
+    def get_run_label(self):
+        return f"Problems: {self.nr_of_problems}"
+
+    def run(self):
+        """
+        :return: Epoch metrics of every problem, a list of P lists like the result of `BaseDiffEvoAlg.run`.
+        """
+        return super().run()
+
+    def _finish_run(self, epoch_metrics, start_time):
+        epoch_metrics = super()._finish_run(epoch_metrics, start_time)
+
+        # Metrics by problem
+        return [list(problem_metrics) for problem_metrics in zip(*epoch_metrics)]
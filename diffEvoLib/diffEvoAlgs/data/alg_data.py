@@ -1,7 +1,10 @@
-from dataclasses import dataclass
+from dataclasses import dataclass, field
+from typing import Optional, Sequence, Union
 
 from diffEvoLib.models.fitness_function import FitnessFunctionBase
 from diffEvoLib.models.enums.boundary_constrain import BoundaryFixing
+from diffEvoLib.models.enums.crossover import CrossoverType
+from diffEvoLib.models.enums.kernel_backend import KernelBackend
 from diffEvoLib.models.enums.optimization import OptimizationType
 
 
@@ -10,11 +13,17 @@ class BaseData:
     num_of_epochs: int
     population_size: int
     nr_of_args: int
-    interval_lower_bound: float
-    interval_higher_bound: float
+    interval_lower_bound: Union[float, Sequence[float]]   # single bound or one bound per dimension
+    interval_higher_bound: Union[float, Sequence[float]]
     mode: OptimizationType
     boundary_constraints_fun: BoundaryFixing
     function: FitnessFunctionBase
+    crossover_type: CrossoverType = field(default=CrossoverType.BINOMIAL, kw_only=True)
+    seed: Optional[int] = field(default=None, kw_only=True)
+    penalty_fitness: Optional[float] = field(default=None, kw_only=True)   # worst value of `mode` by default
+    kernel_backend: KernelBackend = field(default=KernelBackend.NUMPY, kw_only=True)
+    storage_dir: Optional[str] = field(default=None, kw_only=True)   # numpy.memmap files of the populations
+    chunk_size: Optional[int] = field(default=None, kw_only=True)   # rows processed at once, all by default
 
 
 @dataclass
@@ -56,3 +65,11 @@ class EmDeData(BaseData):
 @dataclass
 class ScalingParamsData(BaseData):
     pass
+
+
+@dataclass
+class BatchedDefaultData(BaseData):
+    function: Union[FitnessFunctionBase, Sequence[FitnessFunctionBase]]   # single function or one per problem
+    nr_of_problems: int
+    mutation_factor: Union[float, Sequence[float]]   # single value or one value per problem
+    crossover_rate: Union[float, Sequence[float]]
@@ -1,33 +1,42 @@
 from diffEvoLib.diffEvoAlgs.base import BaseDiffEvoAlg
 from diffEvoLib.diffEvoAlgs.data.alg_data import DefaultAlgData
-from diffEvoLib.diffEvoAlgs.methods.methods_default import mutation, binomial_crossing, selection
+from diffEvoLib.diffEvoAlgs.methods.methods_default import mutation, crossing, selection, fused_trials
+from diffEvoLib.diffEvoAlgs.methods.methods_jit import get_kernel_fun
+from diffEvoLib.evaluators.base import BaseEvaluator
 from diffEvoLib.models.enums.boundary_constrain import fix_boundary_constraints
 
 
 class Default(BaseDiffEvoAlg):
-    def __init__(self, params: DefaultAlgData, db_conn=None, db_auto_write=False):
-        super().__init__(Default.__name__, params, db_conn, db_auto_write)
+    supports_steady_state = True
+    supports_chunked_storage = True
+
+    def __init__(self, params: DefaultAlgData, db_conn=None, db_auto_write=False, evaluator: BaseEvaluator = None):
+        super().__init__(Default.__name__, params, db_conn, db_auto_write, evaluator)
+
+        # Operators of the kernel backend
+        self._fused_trials = get_kernel_fun(fused_trials, self.kernel_backend)
+        self._crossing = get_kernel_fun(crossing, self.kernel_backend)
+        self._selection = get_kernel_fun(selection, self.kernel_backend)
 
         self.mutation_factor = params.mutation_factor  # F
         self.crossover_rate = params.crossover_rate  # Cr
 
-    def next_epoch(self):
-        # New population after mutation
-        v_pop = mutation(self._pop, f=self.mutation_factor)
-
-        # Apply boundary constrains on population in place
-        fix_boundary_constraints(v_pop, self.boundary_constraints_fun)
+    def prepare_epoch(self):
+        # Mutation, boundary constrains and crossing written to the trial buffer
+        return self._fused_trials(self._pop, self.mutation_factor, self.crossover_rate, self.crossover_type,
+                                  self.boundary_constraints_fun, *self.get_trial_buffers(), rng=self._rng)
 
-        # New population after crossing
-        u_pop = binomial_crossing(self._pop, v_pop, cr=self.crossover_rate)
+    def finish_epoch(self, u_pop):
+        # Select new population in place
+        self._selection(self._pop, u_pop)
 
-        # Update values before selection
-        u_pop.update_fitness_values(self._function.eval)
+    def generate_trials(self, indices):
+        target_pop = self._pop.get_subpopulation(indices)
 
-        # Select new population
-        new_pop = selection(self._pop, u_pop)
+        # Mutants of the targets, donors are drawn from the whole population
+        v_pop = mutation(self._pop, f=self.mutation_factor, rng=self._rng, targets=indices)
 
-        # Override data
-        self._pop = new_pop
+        # Apply boundary constrains on mutants in place
+        fix_boundary_constraints(v_pop, self.boundary_constraints_fun, target_pop, rng=self._rng)
 
-        self._epoch_number += 1
+        return self._crossing(target_pop, v_pop, self.crossover_rate, self.crossover_type, rng=self._rng)
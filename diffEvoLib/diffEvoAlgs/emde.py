@@ -1,7 +1,9 @@
 from diffEvoLib.diffEvoAlgs.base import BaseDiffEvoAlg
 from diffEvoLib.diffEvoAlgs.data.alg_data import EmDeData
-from diffEvoLib.diffEvoAlgs.methods.methods_default import binomial_crossing, selection
+from diffEvoLib.diffEvoAlgs.methods.methods_default import crossing, selection
 from diffEvoLib.diffEvoAlgs.methods.methods_emde import em_mutation
+from diffEvoLib.diffEvoAlgs.methods.methods_jit import get_kernel_fun
+from diffEvoLib.evaluators.base import BaseEvaluator
 from diffEvoLib.models.enums.boundary_constrain import fix_boundary_constraints
 
 
@@ -9,29 +11,41 @@ class EmDe(BaseDiffEvoAlg):
     """
     Source: https://link.springer.com/article/10.1007/s13042-015-0479-6#Sec8
     """
+    supports_steady_state = True
 
-    def __init__(self, params: EmDeData, db_conn=None, db_auto_write=False):
-        super().__init__(EmDe.__name__, params, db_conn, db_auto_write)
+    def __init__(self, params: EmDeData, db_conn=None, db_auto_write=False, evaluator: BaseEvaluator = None):
+        super().__init__(EmDe.__name__, params, db_conn, db_auto_write, evaluator)
+
+        # Operators of the kernel backend
+        self._em_mutation = get_kernel_fun(em_mutation, self.kernel_backend)
+        self._crossing = get_kernel_fun(crossing, self.kernel_backend)
+        self._selection = get_kernel_fun(selection, self.kernel_backend)
 
         self.crossover_rate = params.crossover_rate  # Cr
 
-    def next_epoch(self):
+    def prepare_epoch(self):
         # Calculate not constant cr depend on generation number
-        v_pop = em_mutation(self._pop)
+        v_pop = self._em_mutation(self._pop, rng=self._rng)
 
         # Apply boundary constrains on population in place
-        fix_boundary_constraints(v_pop, self.boundary_constraints_fun)
+        fix_boundary_constraints(v_pop, self.boundary_constraints_fun, self._pop, rng=self._rng)
+
+        # Crossing in place, trials are written over the mutants
+        u_pop = self._crossing(self._pop, v_pop, self.crossover_rate, self.crossover_type, rng=self._rng, out=v_pop)
+
+        return u_pop
 
-        # New population after crossing
-        u_pop = binomial_crossing(self._pop, v_pop, self.crossover_rate)
+    def finish_epoch(self, u_pop):
+        # Select new population in place
+        self._selection(self._pop, u_pop)
 
-        # Update values before selection
-        u_pop.update_fitness_values(self._function.eval)
+    def generate_trials(self, indices):
+        target_pop = self._pop.get_subpopulation(indices)
 
-        # Select new population
-        new_pop = selection(self._pop, u_pop)
+        # Mutants of the targets, donors are drawn from the whole population
+        v_pop = self._em_mutation(self._pop, rng=self._rng, targets=indices)
 
-        # Override data
-        self._pop = new_pop
+        # Apply boundary constrains on mutants in place
+        fix_boundary_constraints(v_pop, self.boundary_constraints_fun, target_pop, rng=self._rng)
 
-        self._epoch_number += 1
+        return self._crossing(target_pop, v_pop, self.crossover_rate, self.crossover_type, rng=self._rng)
@@ -0,0 +1,260 @@
+import dataclasses
+import multiprocessing
+import time
+import traceback
+import numpy as np
+from typing import Type
+from tqdm import tqdm
+
+from diffEvoLib.diffEvoAlgs.base import BaseDiffEvoAlg
+from diffEvoLib.diffEvoAlgs.data.alg_data import BaseData
+from diffEvoLib.evaluators.serial import SerialEvaluator
+from diffEvoLib.helpers.metric_helper import MetricHelper
+from diffEvoLib.models.enums.migration_topology import MigrationTopology, get_migration_destinations
+
+
+def _evolve_island(algorithm: BaseDiffEvoAlg, nr_of_epochs, start_time, first_epoch):
+    epoch_metrics = []
+    for epoch in range(first_epoch, first_epoch + nr_of_epochs):
+        algorithm.next_epoch()
+        epoch_metrics.append(algorithm.calculate_metrics(start_time, epoch))
+    return epoch_metrics
+
+
+def _initialize_island(algorithm: BaseDiffEvoAlg):
+    algorithm.initialize()
+    return algorithm.calculate_metrics(0.0, epoch=-1)
+
+
+def _run_island(connection, algorithm_type, params, evaluator_factory):
+    """
+    Main loop of an island process. The algorithm lives in the process for the whole run and executes
+    the commands sent by `IslandModel`, every command is answered with (succeeded, result or traceback).
+    """
+    algorithm = algorithm_type(params, evaluator=evaluator_factory())
+    commands = {
+        "initialize": lambda: _initialize_island(algorithm),
+        "evolve": lambda *args: _evolve_island(algorithm, *args),
+        "emigrate": algorithm.get_migrants,
+        "immigrate": algorithm.accept_migrants,
+        "failures": algorithm.get_evaluation_failures,
+    }
+
+    with algorithm:
+        while True:
+            try:
+                message = connection.recv()
+            except EOFError:
+                # The driver is gone
+                break
+            if message is None:
+                break
+
+            command, args = message
+            try:
+                result = commands[command](*args)
+            except Exception:
+                connection.send((False, traceback.format_exc()))
+            else:
+                connection.send((True, result))
+    connection.close()
+
+
+class IslandModel:
+    """
+    Runs several islands, each an instance of the same algorithm with its own population, in separate worker
+    processes. Every `migration_interval` epochs the best `nr_of_migrants` members of every island are sent to
+    another island according to the topology, where they replace the worst members.
+
+    `params` describe a single island, so every island has `population_size` members and the run takes
+    `num_of_epochs` epochs. The seed of `params` seeds all islands (each gets its own stream) and the random
+    topology. Islands evaluate their members with an evaluator created by `evaluator_factory` in the island
+    process, serially by default, as the islands already use the available cores.
+
+    With the "spawn" start method the algorithm type, the params and the factory have to be picklable.
+    """
+
+    def __init__(self, algorithm_type: Type[BaseDiffEvoAlg], params: BaseData, nr_of_islands=4,
+                 migration_interval=10, nr_of_migrants=1, topology: MigrationTopology = MigrationTopology.RING,
+                 evaluator_factory=SerialEvaluator):
+        """
+        :param algorithm_type: Algorithm of every island, e.g. `Default`, `EmDe` or `NovelModified`.
+        :param params: Parameters of the algorithm, used by every island.
+        :param nr_of_islands: Number of islands, each runs in its own process.
+        :param migration_interval: Number of epochs between migrations.
+        :param nr_of_migrants: Number of best members every island sends at a migration.
+        :param topology: The way islands are connected.
+        :param evaluator_factory: Callable creating the evaluator of an island.
+        """
+        if nr_of_islands < 1:
+            raise ValueError("The island model requires at least one island.")
+        if migration_interval < 1:
+            raise ValueError("The migration interval has to be at least one epoch.")
+        if not 0 <= nr_of_migrants < params.population_size:
+            raise ValueError("The number of migrants has to be smaller than the population size.")
+
+        self.name = f"{IslandModel.__name__}[{algorithm_type.__name__}]"
+        self.algorithm_type = algorithm_type
+        self.nr_of_islands = nr_of_islands
+        self.migration_interval = migration_interval
+        self.nr_of_migrants = nr_of_migrants
+        self.topology = topology
+        self.evaluator_factory = evaluator_factory
+
+        self.num_of_epochs = params.num_of_epochs
+        self.population_size = params.population_size
+        self.nr_of_args = params.nr_of_args
+        self.mode = params.mode
+        self._function = params.function
+
+        # Independent streams for the islands and one for the random topology
+        seed_sequences = np.random.SeedSequence(params.seed).spawn(nr_of_islands + 1)
+        self._island_params = [
+            dataclasses.replace(params, seed=int(seed_sequence.generate_state(1)[0]))
+            for seed_sequence in seed_sequences[:nr_of_islands]
+        ]
+        self._rng = np.random.default_rng(seed_sequences[-1])
+
+        self.run_metadata = {}
+        self._processes = []
+        self._connections = []
+        self._initial_metrics = None
+        self._nr_of_migrations = 0
+        self._is_initialized = False
+
+    def _send(self, island, command, *args):
+        self._connections[island].send((command, args))
+
+    def _receive(self, island):
+        try:
+            succeeded, result = self._connections[island].recv()
+        except EOFError:
+            raise RuntimeError(f"Island {island} of {self.name} stopped unexpectedly.") from None
+
+        if not succeeded:
+            raise RuntimeError(f"Island {island} of {self.name} failed:\n{result}")
+        return result
+
+    def _call_all(self, command, *args):
+        # Commands are sent to all islands first, so they are executed in parallel
+        for island in range(self.nr_of_islands):
+            self._send(island, command, *args)
+        return [self._receive(island) for island in range(self.nr_of_islands)]
+
+    def initialize(self):
+        if self._is_initialized:
+            print(f"{self.name} already initialized.")
+            return
+
+        for island_params in self._island_params:
+            connection, island_connection = multiprocessing.Pipe()
+            process = multiprocessing.Process(
+                target=_run_island,
+                args=(island_connection, self.algorithm_type, island_params, self.evaluator_factory)
+            )
+            process.start()
+            island_connection.close()
+
+            self._processes.append(process)
+            self._connections.append(connection)
+
+        self._initial_metrics = self._call_all("initialize")
+        self._is_initialized = True
+
+    def migrate(self):
+        """
+        Sends the best members of every island to its destination, where they replace the worst members.
+        """
+        if self.nr_of_islands == 1 or self.nr_of_migrants == 0:
+            return
+
+        migrants = self._call_all("emigrate", self.nr_of_migrants)
+        destinations = get_migration_destinations(self.topology, self.nr_of_islands, self._rng)
+
+        receiving_islands = []
+        for island in range(self.nr_of_islands):
+            senders = np.flatnonzero(destinations == island)
+            if len(senders) == 0:
+                continue
+
+            # With the random topology an island can receive migrants of several islands
+            real_values = np.concatenate([migrants[sender][0] for sender in senders])
+            fitness_values = np.concatenate([migrants[sender][1] for sender in senders])
+            self._send(island, "immigrate", real_values, fitness_values)
+            receiving_islands.append(island)
+
+        for island in receiving_islands:
+            self._receive(island)
+        self._nr_of_migrations += 1
+
+    def run(self):
+        if not self._is_initialized:
+            print(f"{self.name} not initialized.")
+            return
+
+        # Metrics of every island and of all islands together
+        population_sizes = [self.population_size] * self.nr_of_islands
+        island_metrics = [[metric] for metric in self._initial_metrics]
+        epoch_metrics = [MetricHelper.combine_metrics(self._initial_metrics, population_sizes, self.mode)]
+
+        start_time = time.time()
+        progress_bar = tqdm(total=self.num_of_epochs, desc=f"{self.name}", unit="epoch")
+        epoch = 0
+        while epoch < self.num_of_epochs:
+            nr_of_epochs = min(self.migration_interval, self.num_of_epochs - epoch)
+            results = self._call_all("evolve", nr_of_epochs, start_time, epoch)
+
+            for metrics, island_result in zip(island_metrics, results):
+                metrics.extend(island_result)
+            for metrics in zip(*results):
+                epoch_metrics.append(MetricHelper.combine_metrics(metrics, population_sizes, self.mode))
+
+            epoch += nr_of_epochs
+            progress_bar.update(nr_of_epochs)
+
+            # No migration after the last epoch
+            if epoch < self.num_of_epochs:
+                self.migrate()
+        progress_bar.close()
+
+        execution_time = time.time() - start_time
+        failures = self._call_all("failures")
+        self.run_metadata = {
+            "execution_time": execution_time,
+            "nr_of_islands": self.nr_of_islands,
+            "topology": self.topology.value,
+            "migration_interval": self.migration_interval,
+            "nr_of_migrants": self.nr_of_migrants,
+            "nr_of_migrations": self._nr_of_migrations,
+            "evaluation_failures": {kind: sum(island_failures[kind] for island_failures in failures)
+                                    for kind in failures[0]},
+            "island_metrics": island_metrics,
+        }
+        print(f'Function: {self._function.name}, Dimension: {self.nr_of_args},'
+              f' Execution time: {execution_time} seconds')
+
+        return epoch_metrics
+
+    def close(self):
+        for connection in self._connections:
+            try:
+                connection.send(None)
+            except (BrokenPipeError, OSError):
+                pass
+
+        for process in self._processes:
+            process.join(timeout=5)
+            if process.is_alive():
+                process.terminate()
+                process.join()
+
+        for connection in self._connections:
+            connection.close()
+        self._processes, self._connections = [], []
+        self._is_initialized = False
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
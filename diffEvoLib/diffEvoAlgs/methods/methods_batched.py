@@ -0,0 +1,86 @@
+import numpy as np
+
+from diffEvoLib.diffEvoAlgs.methods.methods_default import mutation_real_values, get_crossing_mask_fun
+from diffEvoLib.helpers.sampling_helper import sample_distinct_indices
+from diffEvoLib.models.enums.boundary_constrain import BoundaryFixing, get_boundary_constraints_fun
+from diffEvoLib.models.enums.crossover import CrossoverType
+from diffEvoLib.models.enums.optimization import OptimizationType
+
+# Operators of `BatchedDefault`. They work on (P, N, D) tensors of P independent populations, which are treated
+# as a single (P * N, D) matrix of rows, so every operator is a single vectorized operation over all problems.
+# Parameters are given per problem, a scalar or an array of P values.
+
+
+def _per_row(values, nr_of_problems, size):
+    # One value per problem repeated for each of its N rows
+    return np.repeat(np.broadcast_to(np.asarray(values, dtype=float), (nr_of_problems,)), size)
+
+
+def batched_mutation(real_values, f, rng: np.random.Generator = None):
+    """
+        Formula: v_pi = x_p_r1 + F_p(x_p_r2 - x_p_r3), with distinct r1, r2, r3 drawn within problem p
+
+        :param real_values: The (P, N, D) tensor of populations.
+        :param f: Mutation factor of every problem.
+        :return: New (P, N, D) tensor of mutants.
+    """
+    nr_of_problems, size, arg_num = real_values.shape
+    targets = np.tile(np.arange(size), nr_of_problems)
+
+    # Indices within a problem are shifted to rows of the flattened tensor
+    indices = sample_distinct_indices(size, 3, rng=rng, targets=targets)
+    indices += np.repeat(np.arange(nr_of_problems) * size, size).reshape(-1, 1)
+    r1, r2, r3 = indices.T
+
+    rows = real_values.reshape(-1, arg_num)
+    mutants = mutation_real_values(rows[r1], rows[r2], rows[r3], _per_row(f, nr_of_problems, size))
+    return mutants.reshape(real_values.shape)
+
+
+def batched_fix_boundary_constraints(real_values, lower_bounds, upper_bounds, fix_type: BoundaryFixing,
+                                     parent_values=None, rng: np.random.Generator = None):
+    """
+    Fixes all genes of the (P, N, D) tensor `real_values` lying beyond their bounds, in place.
+
+    :param parent_values: The (P, N, D) tensor the modified one was created from, required by MIDPOINT.
+    """
+    arg_num = real_values.shape[-1]
+    rows = real_values.reshape(-1, arg_num)
+    if np.all((lower_bounds <= rows) & (rows <= upper_bounds)):
+        return
+
+    parent_rows = None if parent_values is None else parent_values.reshape(-1, arg_num)
+    boundary_constraints_fun = get_boundary_constraints_fun(fix_type)
+    boundary_constraints_fun(rows, lower_bounds, upper_bounds, parent_rows, rng)
+
+
+def batched_crossing(origin_values, mutated_values, cr, crossover_type: CrossoverType = CrossoverType.BINOMIAL,
+                     rng: np.random.Generator = None):
+    """
+    :param origin_values: The (P, N, D) tensor of targets.
+    :param mutated_values: The (P, N, D) tensor of mutants.
+    :param cr: Crossover rate of every problem.
+    :return: New (P, N, D) tensor of trials.
+    """
+    nr_of_problems, size, arg_num = origin_values.shape
+
+    crossing_mask_fun = get_crossing_mask_fun(crossover_type)
+    mask = crossing_mask_fun(nr_of_problems * size, arg_num, _per_row(cr, nr_of_problems, size), rng=rng)
+    return np.where(mask.reshape(origin_values.shape), mutated_values, origin_values)
+
+
+def batched_selection(real_values, fitness_values, trial_values, trial_fitness_values,
+                      optimization: OptimizationType):
+    """
+    Greedy selection done in place: members of every problem beaten by their trials are overwritten.
+
+    :param real_values: The (P, N, D) tensor of populations.
+    :param fitness_values: The (P, N) matrix of their fitness values.
+    :return: Boolean (P, N) mask of the improved members.
+    """
+    sign = 1.0 if optimization == OptimizationType.MINIMIZATION else -1.0
+    improved = sign * trial_fitness_values < sign * fitness_values
+
+    real_values[improved] = trial_values[improved]
+    fitness_values[improved] = trial_fitness_values[improved]
+    return improved
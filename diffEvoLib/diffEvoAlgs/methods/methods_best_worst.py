@@ -1,42 +1,58 @@
-import random
 import numpy as np
 
-from diffEvoLib.diffEvoAlgs.methods.methods_default import mutation_ind
+from diffEvoLib.diffEvoAlgs.methods.methods_default import mutation_real_values
+from diffEvoLib.helpers.sampling_helper import sample_distinct_indices
 from diffEvoLib.models.population import Population
 
 
-def best_worst_mutation(population: Population):
-    new_members = []
-    for _ in range(population.size):
-        f_l = np.random.uniform()                   # random in (0, 1]
-        f_g = np.random.uniform(low=-1, high=1)     # random in (−1, 0) ∪ (0, 1)
-        while f_g == 0 or f_l == 0:  # not pleasant
-            f_l = np.random.uniform()
-            f_g = np.random.uniform(low=-1, high=1)
-
-        if np.random.uniform() <= 0.5:
-            # Select worst and best members
-            sorted_members = population.get_best_members(population.size)
-            best_member, worst_member = sorted_members[0], sorted_members[-1]
-            selected_member = random.sample(sorted_members[1:-1].tolist(), 1)[0]
-            new_member = mutation_ind(selected_member, best_member, worst_member, f_l)
-        else:
-            # Select members by random
-            selected_members = random.sample(population.members.tolist(), 3)
-            new_member = mutation_ind(selected_members[0], selected_members[1], selected_members[2], f_g)
-
-        new_members.append(new_member)
+def best_worst_mutation(population: Population, rng: np.random.Generator = None):
+    base, member1, member2, f = best_worst_mutation_indices(population, rng=rng)
 
+    real_values = population.real_values
     new_population = Population(
         interval=population.interval,
         arg_num=population.arg_num,
         size=population.size,
         optimization=population.optimization
     )
-    new_population.members = np.array(new_members)
+    new_population.real_values = mutation_real_values(real_values[base], real_values[member1], real_values[member2], f)
     return new_population
 
 
+def best_worst_mutation_indices(population: Population, rng: np.random.Generator = None):
+    """
+    Draws the random parts of `best_worst_mutation`.
+
+    :return: Indices of the base member and of the two members of the difference, and the mutation factor
+             of every mutant.
+    """
+    rng = np.random.default_rng() if rng is None else rng
+    size = population.size
+
+    f_l = rng.uniform(size=size)                    # random in (0, 1]
+    f_g = rng.uniform(low=-1, high=1, size=size)    # random in (−1, 0) ∪ (0, 1)
+    invalid = (f_g == 0) | (f_l == 0)
+    while np.any(invalid):  # not pleasant
+        f_l[invalid] = rng.uniform(size=np.count_nonzero(invalid))
+        f_g[invalid] = rng.uniform(low=-1, high=1, size=np.count_nonzero(invalid))
+        invalid = (f_g == 0) | (f_l == 0)
+
+    # Select worst and best members, the base member is drawn from the remaining ones
+    sorted_indices = population.get_best_indices(size)
+    best, worst = sorted_indices[0], sorted_indices[-1]
+    selected = sorted_indices[1:-1][rng.integers(0, size - 2, size=size)]
+
+    # Select members by random
+    random_indices = sample_distinct_indices(size, 3, rng=rng)
+
+    use_best_worst = rng.uniform(size=size) <= 0.5
+    base = np.where(use_best_worst, selected, random_indices[:, 0])
+    member1 = np.where(use_best_worst, best, random_indices[:, 1])
+    member2 = np.where(use_best_worst, worst, random_indices[:, 2])
+    f = np.where(use_best_worst, f_l, f_g)
+    return base, member1, member2, f
+
+
 def calculate_cr(curr_gen, max_gen, cr_min=0.5, cr_max=0.95, k=4):
     cr = cr_max + (cr_min - cr_max) * (1 - curr_gen / max_gen) ** k
     return cr
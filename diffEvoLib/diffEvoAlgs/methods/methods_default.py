@@ -1,65 +1,132 @@
-import random
 import numpy as np
-import copy
 
-from diffEvoLib.models.member import Member
+from diffEvoLib.helpers.sampling_helper import sample_distinct_indices
 from diffEvoLib.models.population import Population
+from diffEvoLib.models.enums.boundary_constrain import BoundaryFixing, fix_boundary_constraints_values
+from diffEvoLib.models.enums.crossover import CrossoverType
 from diffEvoLib.models.enums.optimization import OptimizationType
 
 
-def mutation_ind(base_member: Member, member1: Member, member2: Member, f):
+def mutation_real_values(base_values, values1, values2, f):
     """
-        Formula: v_ij = x_r1 + F(x_r2 - x_r3)
+        Formula: v_i = x_base_i + F_i(x_1_i - x_2_i), applied to whole (N, D) matrices
+
+        :param f: Mutation factor, a scalar or an array with one value per row.
+    """
+    f = np.asarray(f, dtype=float).reshape(-1, 1) if np.ndim(f) == 1 else f
+    return base_values + f * (values1 - values2)
+
+
+def mutation_real_values_into(real_values, r1, r2, r3, f, out, work):
+    """
+        Formula: v_i = x_r1_i + F_i(x_r2_i - x_r3_i), written to the preallocated (N, D) matrix `out`
+
+        Gives the same values as `mutation_real_values` without temporary matrices.
+
+        :param f: Mutation factor, a scalar or an array with one value per row.
+        :param work: Preallocated scratch matrix of the shape of `out`.
     """
-    new_member = copy.deepcopy(base_member)
-    new_member.chromosomes = base_member.chromosomes + (member1.chromosomes - member2.chromosomes) * f
-    return new_member
+    f = np.asarray(f, dtype=float).reshape(-1, 1) if np.ndim(f) == 1 else f
 
+    # Indices are valid, 'clip' avoids the extra copy 'raise' makes when `out` is given
+    np.take(real_values, r2, axis=0, out=out, mode='clip')
+    np.take(real_values, r3, axis=0, out=work, mode='clip')
+    out -= work
+    out *= f
+    np.take(real_values, r1, axis=0, out=work, mode='clip')
+    out += work
+    return out
 
-def mutation(population: Population, f):
-    new_members = []
-    for _ in range(population.size):
-        selected_members = random.sample(population.members.tolist(), 3)
-        new_member = mutation_ind(selected_members[0], selected_members[1], selected_members[2], f)
-        new_members.append(new_member)
+
+def mutation(population: Population, f, rng: np.random.Generator = None, targets=None):
+    """
+        Formula: v_i = x_r1 + F(x_r2 - x_r3), computed for the whole population at once
+        with distinct r1, r2, r3 drawn for every row
+
+        :param f: Mutation factor, a scalar or an array with one value per member.
+        :param targets: Indices of the members mutants are created for, all members by default.
+    """
+    r1, r2, r3 = sample_distinct_indices(population.size, 3, rng=rng, targets=targets).T
+    real_values = population.real_values
 
     new_population = Population(
         interval=population.interval,
         arg_num=population.arg_num,
-        size=population.size,
+        size=len(r1),
         optimization=population.optimization
     )
-    new_population.members = np.array(new_members)
+    new_population.real_values = mutation_real_values(real_values[r1], real_values[r2], real_values[r3], f)
     return new_population
 
 
-def binomial_crossing_ind(org_member: Member, mut_member: Member, cr):
-    new_member = copy.deepcopy(org_member)
+def binomial_crossing_mask(size, arg_num, cr, rng: np.random.Generator = None, random_values=None, out=None):
+    """
+    Builds the (size, arg_num) mask of genes taken from the mutated population.
 
-    random_numbers = np.random.rand(new_member.args_num)
-    mask = random_numbers <= cr
+    :param cr: Crossover rate, a scalar or an array with one value per member.
+    :param random_values: Optional preallocated (size, arg_num) matrix the random numbers are drawn to.
+    :param out: Optional preallocated boolean (size, arg_num) matrix the mask is written to.
+    """
+    rng = np.random.default_rng() if rng is None else rng
+    cr = np.asarray(cr, dtype=float).reshape(-1, 1) if np.ndim(cr) == 1 else cr
 
-    # ensures that new member gets at least one parameter (giga important line)
-    i_rand = np.random.randint(low=0, high=new_member.args_num)
+    random_values = rng.random((size, arg_num), out=random_values)
+    mask = np.less_equal(random_values, cr, out=out)
 
-    for i in range(new_member.args_num):
-        if mask[i] or i_rand == i:
-            new_member.chromosomes[i].real_value = mut_member.chromosomes[i].real_value
-        else:
-            new_member.chromosomes[i].real_value = org_member.chromosomes[i].real_value
+    # ensures that every new member gets at least one parameter (giga important line)
+    mask[np.arange(size), rng.integers(0, arg_num, size=size)] = True
+    return mask
 
-    return new_member
+
+def exponential_crossing_mask(size, arg_num, cr, rng: np.random.Generator = None):
+    """
+    Builds the (size, arg_num) mask of genes taken from the mutated population. Every member takes a contiguous
+    (circular) block of genes, starting at a random gene and extended while successive random numbers are below cr.
+
+    :param cr: Crossover rate, a scalar or an array with one value per member.
+    """
+    rng = np.random.default_rng() if rng is None else rng
+    cr = np.asarray(cr, dtype=float).reshape(-1, 1) if np.ndim(cr) == 1 else cr
+
+    start = rng.integers(0, arg_num, size=size)
+
+    # Block length is one plus the number of leading successes
+    successes = rng.random((size, arg_num - 1)) < cr
+    length = 1 + np.cumprod(successes, axis=1).sum(axis=1)
+
+    offsets = (np.arange(arg_num) - start.reshape(-1, 1)) % arg_num
+    return offsets < length.reshape(-1, 1)
 
 
-def binomial_crossing(origin_population: Population, mutated_population: Population, cr):
+def get_crossing_mask_fun(crossover_type: CrossoverType):
+    return {
+        CrossoverType.BINOMIAL: binomial_crossing_mask,
+        CrossoverType.EXPONENTIAL: exponential_crossing_mask,
+    }[crossover_type]
+
+
+def crossing(origin_population: Population, mutated_population: Population, cr,
+             crossover_type: CrossoverType = CrossoverType.BINOMIAL, rng: np.random.Generator = None,
+             out: Population = None):
+    """
+    :param cr: Crossover rate, a scalar or an array with one value per member.
+    :param out: Population the trials are written to, e.g. `mutated_population` itself, a new one by default.
+    """
     if origin_population.size != mutated_population.size:
-        print("Binomial_crossing: populations have different sizes")
+        print("Crossing: populations have different sizes")
         return None
 
-    new_members = []
-    for i in range(origin_population.size):
-        new_member = binomial_crossing_ind(origin_population.members[i], mutated_population.members[i], cr)
-        new_members.append(new_member)
+    crossing_mask_fun = get_crossing_mask_fun(crossover_type)
+    mask = crossing_mask_fun(origin_population.size, origin_population.arg_num, cr, rng=rng)
+
+    if out is not None:
+        # Genes of the mutants are kept, the other ones are taken from the origin
+        if out is not mutated_population:
+            np.copyto(out.real_values, mutated_population.real_values)
+        np.logical_not(mask, out=mask)
+        np.copyto(out.real_values, origin_population.real_values, where=mask)
+        out.fitness_values[:] = np.nan
+        return out
 
     new_population = Population(
         interval=origin_population.interval,
@@ -67,12 +134,85 @@ def binomial_crossing(origin_population: Population, mutated_population: Populat
         size=origin_population.size,
         optimization=origin_population.optimization
     )
-    new_population.members = np.array(new_members)
+    new_population.real_values = np.where(mask, mutated_population.real_values, origin_population.real_values)
     return new_population
 
 
-def selection(origin_population: Population, modified_population: Population):
-    if origin_population.size != modified_population.size:
+def rows_of(values, rows):
+    """
+    :param values: A scalar or an array with one value per member.
+    :return: The values of the members in `rows`.
+    """
+    return values[rows] if np.ndim(values) == 1 else values
+
+
+def fused_trials(population: Population, f, cr, crossover_type: CrossoverType, fix_type: BoundaryFixing,
+                 trial_population: Population, work_values, mask, rng: np.random.Generator = None):
+    """
+    Mutation (v_i = x_r1 + F(x_r2 - x_r3)), boundary fixing and crossover in a single pass, written to the
+    preallocated `trial_population`, so no population or temporary matrix is allocated per epoch. Gives the same
+    trials as `mutation`, `fix_boundary_constraints` and `crossing` for the same random generator state.
+
+    Rows are processed in the chunks of `Population.row_chunks`. With several chunks the random numbers of the
+    boundary fixing and the crossing are drawn chunk by chunk, so the trials differ from the ones of a single chunk.
+
+    :param f: Mutation factor, a scalar or an array with one value per member.
+    :param cr: Crossover rate, a scalar or an array with one value per member.
+    :param work_values: Preallocated scratch matrix with the columns of the population matrix and the rows of a chunk.
+    :param mask: Preallocated boolean matrix of the shape of `work_values`.
+    :return: `trial_population`, not evaluated yet.
+    """
+    r1, r2, r3 = sample_distinct_indices(population.size, 3, rng=rng).T
+    real_values = population.real_values
+    lower_bounds, upper_bounds = population.lower_bounds, population.upper_bounds
+
+    for rows in population.row_chunks():
+        nr_of_rows = rows.stop - rows.start
+        trial_values, parent_values = trial_population.real_values[rows], real_values[rows]
+        chunk_work_values, chunk_mask = work_values[:nr_of_rows], mask[:nr_of_rows]
+
+        mutation_real_values_into(real_values, r1[rows], r2[rows], r3[rows], rows_of(f, rows), out=trial_values,
+                                  work=chunk_work_values)
+
+        # Apply boundary constrains on mutants in place
+        fix_boundary_constraints_values(trial_values, lower_bounds, upper_bounds, fix_type, parent_values, rng=rng)
+
+        if crossover_type == CrossoverType.BINOMIAL:
+            binomial_crossing_mask(nr_of_rows, population.arg_num, rows_of(cr, rows), rng=rng,
+                                   random_values=chunk_work_values, out=chunk_mask)
+        else:
+            chunk_mask[:] = get_crossing_mask_fun(crossover_type)(nr_of_rows, population.arg_num, rows_of(cr, rows),
+                                                                  rng=rng)
+
+        # Genes of the mutants are kept, the other ones are taken from the targets
+        np.logical_not(chunk_mask, out=chunk_mask)
+        np.copyto(trial_values, parent_values, where=chunk_mask)
+
+    trial_population.fitness_values[:] = np.nan
+    return trial_population
+
+
+def binomial_crossing(origin_population: Population, mutated_population: Population, cr,
+                      rng: np.random.Generator = None):
+    return crossing(origin_population, mutated_population, cr, CrossoverType.BINOMIAL, rng=rng)
+
+
+def exponential_crossing(origin_population: Population, mutated_population: Population, cr,
+                         rng: np.random.Generator = None):
+    return crossing(origin_population, mutated_population, cr, CrossoverType.EXPONENTIAL, rng=rng)
+
+
+def selection(origin_population: Population, modified_population: Population, indices=None):
+    """
+    Greedy selection done in place: rows of `origin_population` beaten by `modified_population` are overwritten,
+    all other rows are left untouched.
+
+    :param indices: Rows of `origin_population` the rows of `modified_population` compete with,
+                    all rows in order by default.
+    :return: Boolean mask of the improved members (of `modified_population`).
+    """
+    indices = np.arange(origin_population.size) if indices is None else np.asarray(indices, dtype=np.intp)
+    if len(indices) != modified_population.size:
         print("Selection: populations have different sizes")
         return None
 
@@ -80,25 +220,14 @@ def selection(origin_population: Population, modified_population: Population):
         print("Selection: populations have different optimization types")
         return None
 
-    optimization = origin_population.optimization
-    new_members = []
-    for i in range(origin_population.size):
-        if optimization == OptimizationType.MINIMIZATION:
-            if origin_population.members[i] <= modified_population.members[i]:
-                new_members.append(copy.deepcopy(origin_population.members[i]))
-            else:
-                new_members.append(copy.deepcopy(modified_population.members[i]))
-        elif optimization == OptimizationType.MAXIMIZATION:
-            if origin_population.members[i] >= modified_population.members[i]:
-                new_members.append(copy.deepcopy(origin_population.members[i]))
-            else:
-                new_members.append(copy.deepcopy(modified_population.members[i]))
-
-    new_population = Population(
-        interval=origin_population.interval,
-        arg_num=origin_population.arg_num,
-        size=origin_population.size,
-        optimization=origin_population.optimization
-    )
-    new_population.members = np.array(new_members)
-    return new_population
+    sign = 1.0 if origin_population.optimization == OptimizationType.MINIMIZATION else -1.0
+    improved = sign * modified_population.fitness_values < sign * origin_population.fitness_values[indices]
+
+    # Improved rows are copied in chunks, so at most a chunk of them is gathered in memory
+    targets, improved_rows = indices[improved], np.flatnonzero(improved)
+    chunk_size = max(len(targets) if origin_population.chunk_size is None else origin_population.chunk_size, 1)
+    for start in range(0, len(targets), chunk_size):
+        stop = start + chunk_size
+        origin_population.real_values[targets[start:stop]] = modified_population.real_values[improved_rows[start:stop]]
+    origin_population.fitness_values[targets] = modified_population.fitness_values[improved]
+    return improved
@@ -1,50 +1,61 @@
-import random
 import numpy as np
-import copy
 
-from diffEvoLib.models.member import Member
+from diffEvoLib.helpers.sampling_helper import sample_distinct_indices
 from diffEvoLib.models.population import Population
 
 
-def em_mutation_ind(best_member: Member, better_member: Member, worst_member: Member):
+def em_mutation(population: Population, rng: np.random.Generator = None, targets=None):
     """
-        Formula: v_i = x_c + F1(x_best - x_better) + F2(x_best - x_worst) + F3(x_better - x_worst)
-    """
-    new_member = copy.deepcopy(best_member)
-
-    fs = np.random.uniform(size=3)
-    w1, w2, w3 = get_weights()
-
-    member_c = best_member.chromosomes * w1 + better_member.chromosomes * w2 + worst_member.chromosomes * w3
-    f1_component = (best_member.chromosomes - better_member.chromosomes) * fs[0]
-    f2_component = (best_member.chromosomes - worst_member.chromosomes) * fs[1]
-    f3_component = (better_member.chromosomes - worst_member.chromosomes) * fs[2]
-    new_member.chromosomes = member_c + f1_component + f2_component + f3_component
+        Formula: v_i = x_c + F1(x_best - x_better) + F2(x_best - x_worst) + F3(x_better - x_worst),
+        computed for the whole population at once
 
-    return new_member
+        :param targets: Indices of the members mutants are created for, all members by default.
+    """
+    best, better, worst, fs, weights = em_mutation_coefficients(population.size, rng=rng, targets=targets)
+    size = len(best)
+    fs = fs.reshape(size, 3, 1)
+    w1, w2, w3 = (w.reshape(-1, 1) for w in weights)
 
+    real_values = population.real_values
+    best_values, better_values, worst_values = real_values[best], real_values[better], real_values[worst]
 
-def em_mutation(population: Population):
-    new_members = []
-    for _ in range(population.size):
-        selected_members = random.sample(population.members.tolist(), 3)
-        new_member = em_mutation_ind(selected_members[0], selected_members[1], selected_members[2])
-        new_members.append(new_member)
+    member_c = best_values * w1 + better_values * w2 + worst_values * w3
+    f1_component = (best_values - better_values) * fs[:, 0]
+    f2_component = (best_values - worst_values) * fs[:, 1]
+    f3_component = (better_values - worst_values) * fs[:, 2]
 
     new_population = Population(
         interval=population.interval,
         arg_num=population.arg_num,
-        size=population.size,
+        size=size,
         optimization=population.optimization
     )
-    new_population.members = np.array(new_members)
+    new_population.real_values = member_c + f1_component + f2_component + f3_component
     return new_population
 
 
-def get_weights():
+def em_mutation_coefficients(size, rng: np.random.Generator = None, targets=None):
+    """
+    Draws the random parts of `em_mutation`.
+
+    :return: Indices of the best, better and worst member of every mutant, the (len(targets), 3) matrix
+             of F1, F2, F3 and the weights w1, w2, w3 of every mutant.
+    """
+    rng = np.random.default_rng() if rng is None else rng
+
+    best, better, worst = sample_distinct_indices(size, 3, rng=rng, targets=targets).T
+    fs = rng.uniform(size=(len(best), 3))
+    weights = get_weights(rng, size=len(best))
+    return best, better, worst, fs, weights
+
+
+def get_weights(rng: np.random.Generator, size=None):
+    """
+    :param size: Number of weight triples to draw, a single triple of scalars when not given.
+    """
     p1 = 1.0
-    p2 = np.random.uniform(low=0.75, high=1.0)
-    p3 = np.random.uniform(low=0.5, high=p2)
+    p2 = rng.uniform(low=0.75, high=1.0, size=size)
+    p3 = rng.uniform(low=0.5, high=p2, size=size)
     p_sum = p1 + p2 + p3
 
     w1 = p1 / p_sum
@@ -0,0 +1,274 @@
+import importlib.util
+import numpy as np
+
+from diffEvoLib.diffEvoAlgs.methods.methods_best_worst import best_worst_mutation, best_worst_mutation_indices
+from diffEvoLib.diffEvoAlgs.methods.methods_default import fused_trials, crossing, selection, \
+    binomial_crossing_mask, get_crossing_mask_fun, rows_of
+from diffEvoLib.diffEvoAlgs.methods.methods_emde import em_mutation, em_mutation_coefficients
+from diffEvoLib.helpers.sampling_helper import sample_distinct_indices
+from diffEvoLib.models.enums.boundary_constrain import BoundaryFixing, fix_boundary_constraints_values
+from diffEvoLib.models.enums.crossover import CrossoverType
+from diffEvoLib.models.enums.kernel_backend import KernelBackend
+from diffEvoLib.models.enums.optimization import OptimizationType
+from diffEvoLib.models.population import Population
+
+# JIT compiled variants of the operators of `methods_default`, `methods_emde` and `methods_best_worst`, used by
+# the NUMBA kernel backend. Random numbers are drawn with NumPy in the order of the reference operators and passed
+# to the kernels, so both give the same results for the same random generator state. The kernels are compiled
+# on first use and cached on disk.
+
+# Kernels compiled so far, by their Python function
+_jit_kernels = {}
+
+# Boundary fixing of `_fused_trials_kernel`, RANDOM draws random numbers and is fixed with NumPy
+_FIX_CODES = {
+    BoundaryFixing.CLIPPING: 0,
+    BoundaryFixing.REFLECTION: 1,
+    BoundaryFixing.MIDPOINT: 2,
+    BoundaryFixing.WRAP: 3,
+}
+
+
+def numba_available():
+    return importlib.util.find_spec("numba") is not None
+
+
+def resolve_kernel_backend(kernel_backend: KernelBackend, name):
+    """
+    :return: The backend to use, NUMPY instead of NUMBA when numba is not installed.
+    """
+    if kernel_backend == KernelBackend.NUMBA and not numba_available():
+        print(f"{name}: numba is not installed, the NumPy kernels are used.")
+        return KernelBackend.NUMPY
+    return kernel_backend
+
+
+def get_kernel_fun(operator, kernel_backend: KernelBackend):
+    """
+    :param operator: A NumPy operator, e.g. `selection`.
+    :return: Its JIT variant for the NUMBA backend, the operator itself otherwise.
+    """
+    if kernel_backend == KernelBackend.NUMBA:
+        return _JIT_OPERATORS.get(operator, operator)
+    return operator
+
+
+def _get_kernel(kernel):
+    if kernel not in _jit_kernels:
+        import numba
+        _jit_kernels[kernel] = numba.njit(cache=True, nogil=True)(kernel)
+    return _jit_kernels[kernel]
+
+
+def _per_row(values, size):
+    return np.ascontiguousarray(np.broadcast_to(np.asarray(values, dtype=float), (size,)))
+
+
+# Kernels, compiled by `_get_kernel`. Arithmetic follows the order of the NumPy operators.
+
+
+def _mutation_kernel(real_values, base, member1, member2, f, out):
+    size, arg_num = out.shape
+    for i in range(size):
+        for j in range(arg_num):
+            out[i, j] = real_values[base[i], j] + f[i] * (real_values[member1[i], j] - real_values[member2[i], j])
+
+
+def _fused_trials_kernel(real_values, parent_values, r1, r2, r3, f, lower_bounds, upper_bounds, fix_code, mask,
+                         out):
+    size, arg_num = out.shape
+    for i in range(size):
+        for j in range(arg_num):
+            parent_value = parent_values[i, j]
+            if not mask[i, j]:
+                out[i, j] = parent_value
+                continue
+
+            value = real_values[r1[i], j] + f[i] * (real_values[r2[i], j] - real_values[r3[i], j])
+            lower, upper = lower_bounds[j], upper_bounds[j]
+            if value > upper:
+                if fix_code == 0:
+                    value = upper
+                elif fix_code == 1:
+                    value = 2 * upper - value
+                elif fix_code == 2:
+                    value = (parent_value + upper) / 2
+                elif upper > lower:
+                    value = lower + (value - lower) % (upper - lower)
+                else:
+                    value = lower
+            elif value < lower:
+                if fix_code == 0:
+                    value = lower
+                elif fix_code == 1:
+                    value = 2 * lower - value
+                elif fix_code == 2:
+                    value = (parent_value + lower) / 2
+                elif upper > lower:
+                    value = lower + (value - lower) % (upper - lower)
+                else:
+                    value = lower
+            out[i, j] = value
+
+
+def _crossing_kernel(origin_values, mutated_values, mask, out):
+    size, arg_num = out.shape
+    for i in range(size):
+        for j in range(arg_num):
+            out[i, j] = mutated_values[i, j] if mask[i, j] else origin_values[i, j]
+
+
+def _em_mutation_kernel(real_values, best, better, worst, fs, w1, w2, w3, out):
+    size, arg_num = out.shape
+    for i in range(size):
+        for j in range(arg_num):
+            best_value = real_values[best[i], j]
+            better_value = real_values[better[i], j]
+            worst_value = real_values[worst[i], j]
+
+            member_c = best_value * w1[i] + better_value * w2[i] + worst_value * w3[i]
+            out[i, j] = member_c + (best_value - better_value) * fs[i, 0] + (best_value - worst_value) * fs[i, 1] \
+                + (better_value - worst_value) * fs[i, 2]
+
+
+def _selection_kernel(origin_values, origin_fitness_values, values, fitness_values, indices, sign, improved):
+    arg_num = values.shape[1]
+    for k in range(len(indices)):
+        i = indices[k]
+        improved[k] = sign * fitness_values[k] < sign * origin_fitness_values[i]
+        if improved[k]:
+            origin_fitness_values[i] = fitness_values[k]
+            for j in range(arg_num):
+                origin_values[i, j] = values[k, j]
+
+
+# Operators, with the signatures of their NumPy references
+
+
+def jit_fused_trials(population: Population, f, cr, crossover_type: CrossoverType, fix_type: BoundaryFixing,
+                     trial_population: Population, work_values, mask, rng: np.random.Generator = None):
+    """
+    JIT variant of `fused_trials`, mutation, boundary fixing and crossover of a chunk are done in a single pass.
+    """
+    r1, r2, r3 = sample_distinct_indices(population.size, 3, rng=rng).T
+    real_values = population.real_values
+    f = _per_row(f, population.size)
+    lower_bounds = np.ascontiguousarray(population.lower_bounds)
+    upper_bounds = np.ascontiguousarray(population.upper_bounds)
+    # RANDOM fixing draws random numbers, it is done with NumPy before the ones of the crossing are drawn
+    fix_code = _FIX_CODES.get(fix_type, -1)
+
+    for rows in population.row_chunks():
+        nr_of_rows = rows.stop - rows.start
+        trial_values, parent_values = trial_population.real_values[rows], real_values[rows]
+        chunk_work_values, chunk_mask = work_values[:nr_of_rows], mask[:nr_of_rows]
+
+        if fix_code == -1:
+            _get_kernel(_mutation_kernel)(real_values, r1[rows], r2[rows], r3[rows], f[rows], trial_values)
+            fix_boundary_constraints_values(trial_values, lower_bounds, upper_bounds, fix_type, parent_values,
+                                            rng=rng)
+
+        if crossover_type == CrossoverType.BINOMIAL:
+            binomial_crossing_mask(nr_of_rows, population.arg_num, rows_of(cr, rows), rng=rng,
+                                   random_values=chunk_work_values, out=chunk_mask)
+        else:
+            chunk_mask[:] = get_crossing_mask_fun(crossover_type)(nr_of_rows, population.arg_num, rows_of(cr, rows),
+                                                                  rng=rng)
+
+        if fix_code == -1:
+            _get_kernel(_crossing_kernel)(parent_values, trial_values, chunk_mask, trial_values)
+        else:
+            _get_kernel(_fused_trials_kernel)(real_values, parent_values, r1[rows], r2[rows], r3[rows], f[rows],
+                                              lower_bounds, upper_bounds, fix_code, chunk_mask, trial_values)
+
+    trial_population.fitness_values[:] = np.nan
+    return trial_population
+
+
+def jit_crossing(origin_population: Population, mutated_population: Population, cr,
+                 crossover_type: CrossoverType = CrossoverType.BINOMIAL, rng: np.random.Generator = None,
+                 out: Population = None):
+    """
+    JIT variant of `crossing`.
+    """
+    if origin_population.size != mutated_population.size:
+        print("Crossing: populations have different sizes")
+        return None
+
+    crossing_mask_fun = get_crossing_mask_fun(crossover_type)
+    mask = crossing_mask_fun(origin_population.size, origin_population.arg_num, cr, rng=rng)
+
+    if out is None:
+        out = Population(
+            interval=origin_population.interval,
+            arg_num=origin_population.arg_num,
+            size=origin_population.size,
+            optimization=origin_population.optimization
+        )
+    _get_kernel(_crossing_kernel)(origin_population.real_values, mutated_population.real_values, mask,
+                                  out.real_values)
+    out.fitness_values[:] = np.nan
+    return out
+
+
+def jit_em_mutation(population: Population, rng: np.random.Generator = None, targets=None):
+    """
+    JIT variant of `em_mutation`.
+    """
+    best, better, worst, fs, (w1, w2, w3) = em_mutation_coefficients(population.size, rng=rng, targets=targets)
+
+    new_population = Population(
+        interval=population.interval,
+        arg_num=population.arg_num,
+        size=len(best),
+        optimization=population.optimization
+    )
+    _get_kernel(_em_mutation_kernel)(population.real_values, best, better, worst, fs, w1, w2, w3,
+                                     new_population.real_values)
+    return new_population
+
+
+def jit_best_worst_mutation(population: Population, rng: np.random.Generator = None):
+    """
+    JIT variant of `best_worst_mutation`.
+    """
+    base, member1, member2, f = best_worst_mutation_indices(population, rng=rng)
+
+    new_population = Population(
+        interval=population.interval,
+        arg_num=population.arg_num,
+        size=population.size,
+        optimization=population.optimization
+    )
+    _get_kernel(_mutation_kernel)(population.real_values, base, member1, member2, f, new_population.real_values)
+    return new_population
+
+
+def jit_selection(origin_population: Population, modified_population: Population, indices=None):
+    """
+    JIT variant of `selection`, `indices` are expected to be distinct.
+    """
+    indices = np.arange(origin_population.size) if indices is None else np.asarray(indices, dtype=np.intp)
+    if len(indices) != modified_population.size:
+        print("Selection: populations have different sizes")
+        return None
+
+    if origin_population.optimization != modified_population.optimization:
+        print("Selection: populations have different optimization types")
+        return None
+
+    sign = 1.0 if origin_population.optimization == OptimizationType.MINIMIZATION else -1.0
+    improved = np.empty(len(indices), dtype=bool)
+    _get_kernel(_selection_kernel)(origin_population.real_values, origin_population.fitness_values,
+                                   modified_population.real_values, modified_population.fitness_values,
+                                   indices, sign, improved)
+    return improved
+
+
+_JIT_OPERATORS = {
+    fused_trials: jit_fused_trials,
+    crossing: jit_crossing,
+    em_mutation: jit_em_mutation,
+    best_worst_mutation: jit_best_worst_mutation,
+    selection: jit_selection,
+}
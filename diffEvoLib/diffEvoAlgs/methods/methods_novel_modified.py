@@ -1,22 +1,13 @@
-import random
 import numpy as np
-import copy
 
-from diffEvoLib.diffEvoAlgs.methods.methods_default import mutation_ind, binomial_crossing_ind
-from diffEvoLib.models.enums.optimization import OptimizationType
+from diffEvoLib.diffEvoAlgs.methods.methods_default import mutation_real_values, selection
+from diffEvoLib.helpers.sampling_helper import sample_distinct_indices
 from diffEvoLib.models.population import Population
 
 
-def nm_mutation(population: Population, f_arr):
-    new_members = []
-    for i in range(population.size):
-        pop_without_element = population.members.tolist()
-        pop_without_element.pop(i)
-
-        selected_members = random.sample(pop_without_element, 3)
-        new_member = mutation_ind(selected_members[0], selected_members[1], selected_members[2], f_arr[i])
-
-        new_members.append(new_member)
+def nm_mutation(population: Population, f_arr, rng: np.random.Generator = None):
+    r1, r2, r3 = sample_distinct_indices(population.size, 3, exclude_self=True, rng=rng).T
+    real_values = population.real_values
 
     new_population = Population(
         interval=population.interval,
@@ -24,64 +15,12 @@ def nm_mutation(population: Population, f_arr):
         size=population.size,
         optimization=population.optimization
     )
-    new_population.members = np.array(new_members)
-    return new_population
-
-
-def nm_binomial_crossing(origin_population: Population, mutated_population: Population, cr_arr):
-    if origin_population.size != mutated_population.size:
-        print("Binomial_crossing: populations have different sizes")
-        return None
-
-    new_members = []
-    for i in range(origin_population.size):
-        new_member = binomial_crossing_ind(origin_population.members[i], mutated_population.members[i], cr_arr[i])
-        new_members.append(new_member)
-
-    new_population = Population(
-        interval=origin_population.interval,
-        arg_num=origin_population.arg_num,
-        size=origin_population.size,
-        optimization=origin_population.optimization
-    )
-    new_population.members = np.array(new_members)
+    new_population.real_values = mutation_real_values(real_values[r1], real_values[r2], real_values[r3], f_arr)
     return new_population
 
 
 def nm_selection(origin_population: Population, modified_population: Population):
-    if origin_population.size != modified_population.size:
-        print("Selection: populations have different sizes")
-        return None
-
-    if origin_population.optimization != modified_population.optimization:
-        print("Selection: populations have different optimization types")
-        return None
-
-    optimization = origin_population.optimization
-    new_members = []
-    better_members_indexes = []
-    for i in range(origin_population.size):
-        if optimization == OptimizationType.MINIMIZATION:
-            if origin_population.members[i] <= modified_population.members[i]:
-                new_members.append(copy.deepcopy(origin_population.members[i]))
-            else:
-                new_members.append(copy.deepcopy(modified_population.members[i]))
-                better_members_indexes.append(i)
-        elif optimization == OptimizationType.MAXIMIZATION:
-            if origin_population.members[i] >= modified_population.members[i]:
-                new_members.append(copy.deepcopy(origin_population.members[i]))
-            else:
-                new_members.append(copy.deepcopy(modified_population.members[i]))
-                better_members_indexes.append(i)
-
-    new_population = Population(
-        interval=origin_population.interval,
-        arg_num=origin_population.arg_num,
-        size=origin_population.size,
-        optimization=origin_population.optimization
-    )
-    new_population.members = np.array(new_members)
-    return new_population, better_members_indexes
+    return selection(origin_population, modified_population)
 
 
 def nm_calculate_fm_crm(set_f: set, set_cr: set):
@@ -91,9 +30,9 @@ def nm_calculate_fm_crm(set_f: set, set_cr: set):
     return f_m, cr_m
 
 
-def nm_update_f_cr(f_m, cr_m, delta_f, delta_cr):
-    f_i = np.random.uniform(low=f_m - delta_f, high=f_m + delta_f)
-    cr_i = np.random.uniform(low=cr_m - delta_cr, high=cr_m + delta_cr)
+def nm_update_f_cr(f_m, cr_m, delta_f, delta_cr, rng: np.random.Generator):
+    f_i = rng.uniform(low=f_m - delta_f, high=f_m + delta_f)
+    cr_i = rng.uniform(low=cr_m - delta_cr, high=cr_m + delta_cr)
 
     if f_i > 2:
         f_i = 2
@@ -1,27 +1,33 @@
-import random
 import numpy as np
 
-from diffEvoLib.diffEvoAlgs.methods.methods_default import mutation_ind
+from diffEvoLib.diffEvoAlgs.methods.methods_default import mutation_real_values
+from diffEvoLib.helpers.sampling_helper import sample_distinct_indices
+from diffEvoLib.models.enums.optimization import OptimizationType
 from diffEvoLib.models.population import Population
 
 
-def rl_mutation(population: Population):
-    new_members = []
-    for _ in range(population.size):
-        selected_members = np.array(random.sample(population.members.tolist(), 3))
-        sorted_indices = np.argsort([member.fitness_value for member in selected_members])
-        best_member, better_member, worst_member = selected_members[sorted_indices]
+def rl_mutation(population: Population, rng: np.random.Generator = None):
+    rng = np.random.default_rng() if rng is None else rng
 
-        f = random.uniform(-0.6, -0.4) if random.random() < 0.5 else random.uniform(0.4, 0.6)  # (−1, -0.4) ∪ (0.4, 1)
-        new_member = mutation_ind(best_member, better_member, worst_member, f)
+    # Order the three selected members of every row by fitness: best, better, worst
+    selected_indices = sample_distinct_indices(population.size, 3, rng=rng)
+    sign = 1.0 if population.optimization == OptimizationType.MINIMIZATION else -1.0
+    sorted_indices = np.argsort(sign * population.fitness_values[selected_indices], axis=1)
+    best, better, worst = np.take_along_axis(selected_indices, sorted_indices, axis=1).T
 
-        new_members.append(new_member)
+    # (−1, -0.4) ∪ (0.4, 1)
+    f = np.where(
+        rng.random(population.size) < 0.5,
+        rng.uniform(-0.6, -0.4, size=population.size),
+        rng.uniform(0.4, 0.6, size=population.size)
+    )
 
+    real_values = population.real_values
     new_population = Population(
         interval=population.interval,
         arg_num=population.arg_num,
         size=population.size,
         optimization=population.optimization
     )
-    new_population.members = np.array(new_members)
+    new_population.real_values = mutation_real_values(real_values[best], real_values[better], real_values[worst], f)
     return new_population
@@ -1,39 +1,33 @@
 from diffEvoLib.diffEvoAlgs.base import BaseDiffEvoAlg
 from diffEvoLib.diffEvoAlgs.data.alg_data import ScalingParamsData
-from diffEvoLib.diffEvoAlgs.methods.methods_default import selection, mutation
-from diffEvoLib.diffEvoAlgs.methods.methods_scaling_params import sp_get_f, sp_get_cr, sp_binomial_crossing
-from diffEvoLib.models.enums.boundary_constrain import fix_boundary_constraints
+from diffEvoLib.diffEvoAlgs.methods.methods_default import selection, fused_trials
+from diffEvoLib.diffEvoAlgs.methods.methods_jit import get_kernel_fun
+from diffEvoLib.diffEvoAlgs.methods.methods_scaling_params import sp_get_f, sp_get_cr
+from diffEvoLib.evaluators.base import BaseEvaluator
 
 
 class ScalingParams(BaseDiffEvoAlg):
     """
     Source: https://www.scirp.org/journal/paperinformation.aspx?paperid=96749
     """
+    supports_chunked_storage = True
 
-    def __init__(self, params: ScalingParamsData, db_conn=None, db_auto_write=False):
-        super().__init__(ScalingParams.__name__, params, db_conn, db_auto_write)
+    def __init__(self, params: ScalingParamsData, db_conn=None, db_auto_write=False, evaluator: BaseEvaluator = None):
+        super().__init__(ScalingParams.__name__, params, db_conn, db_auto_write, evaluator)
 
-    def next_epoch(self):
+        # Operators of the kernel backend
+        self._fused_trials = get_kernel_fun(fused_trials, self.kernel_backend)
+        self._selection = get_kernel_fun(selection, self.kernel_backend)
+
+    def prepare_epoch(self):
         # Calculate F and CR
         f = sp_get_f(self._epoch_number, self.num_of_epochs)
         cr_arr = sp_get_cr(self._pop)
 
-        # New population after mutation
-        v_pop = mutation(self._pop, f)
-
-        # Apply boundary constrains on population in place
-        fix_boundary_constraints(v_pop, self.boundary_constraints_fun)
-
-        # New population after crossing
-        u_pop = sp_binomial_crossing(self._pop, v_pop, cr_arr)
-
-        # Update values before selection
-        u_pop.update_fitness_values(self._function.eval)
-
-        # Select new population
-        new_pop = selection(self._pop, u_pop)
-
-        # Override data
-        self._pop = new_pop
+        # Mutation, boundary constrains and crossing written to the trial buffer
+        return self._fused_trials(self._pop, f, cr_arr, self.crossover_type, self.boundary_constraints_fun,
+                                  *self.get_trial_buffers(), rng=self._rng)
 
-        self._epoch_number += 1
+    def finish_epoch(self, u_pop):
+        # Select new population in place
+        self._selection(self._pop, u_pop)
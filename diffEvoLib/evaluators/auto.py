@@ -0,0 +1,167 @@
+import math
+import os
+import time
+import numpy as np
+
+from diffEvoLib.evaluators.base import BaseEvaluator, evaluate_chunk
+from diffEvoLib.evaluators.process_pool import ProcessPoolEvaluator
+from diffEvoLib.evaluators.serial import SerialEvaluator
+from diffEvoLib.evaluators.thread_pool import ThreadPoolEvaluator
+from diffEvoLib.models.fitness_function import FitnessFunctionBase
+
+
+class AutoEvaluator(BaseEvaluator):
+    """
+    Picks the fastest backend for a fitness function from timed evaluations of the first matrix it gets
+    (the initial population), then delegates all evaluations to it.
+
+    - vectorized functions are evaluated serially with a single call,
+    - cheap functions, for which parallel overhead dominates, are evaluated serially,
+    - otherwise the thread and process pools are timed on a sample of rows against the serial estimate.
+
+    The chunk size is chosen so that a single task runs for at least `min_task_time` seconds, but each
+    worker still gets at least one chunk. The function is tuned again when a different one is evaluated.
+    With a timeout the thread pool is not tried, as it can't interrupt evaluations. Async functions evaluated
+    by `evaluate_async` are awaited on the running event loop, which is recorded as the "async" backend.
+    """
+    name = "auto"
+
+    def __init__(self, max_workers=None, min_task_time=0.005, parallel_threshold=0.001, nr_of_probes=3,
+                 adaptive_chunking=False, timeout=None):
+        """
+        :param max_workers: Number of workers of the parallel backends.
+        :param min_task_time: Minimal run time (seconds) of a single parallel task.
+        :param parallel_threshold: Serial evaluation time (seconds) of the whole matrix below which
+                                   parallel backends are not tried.
+        :param nr_of_probes: Number of rows evaluated to estimate the cost of a single evaluation.
+        :param adaptive_chunking: Whether the parallel backends use adaptive chunking, the chosen chunk size
+                                  is then the size of the largest chunk.
+        :param timeout: Time limit (seconds) of a single evaluation.
+        """
+        super().__init__(timeout=timeout)
+        self.max_workers = max_workers if max_workers is not None else (os.cpu_count() or 1)
+        self.min_task_time = min_task_time
+        self.parallel_threshold = parallel_threshold
+        self.nr_of_probes = nr_of_probes
+        self.adaptive_chunking = adaptive_chunking
+
+        self.timings = {}
+        self._evaluator: BaseEvaluator = None
+        self._fitness_fun = None
+        # Whether the function is awaited on the event loop by `evaluate_async`
+        self._is_awaited = False
+
+    def tune(self, fitness_fun: FitnessFunctionBase, real_values):
+        self.shutdown()
+        self.timings = {}
+        self._fitness_fun = fitness_fun
+        self._is_awaited = False
+
+        if fitness_fun.vectorized or self.max_workers == 1 or len(real_values) <= 1:
+            self._evaluator = SerialEvaluator(self.timeout)
+            return
+
+        # Cost of a single evaluation
+        probes = real_values[:self.nr_of_probes]
+        start_time = time.perf_counter()
+        evaluate_chunk(fitness_fun, probes, self.timeout)
+        eval_time = (time.perf_counter() - start_time) / len(probes)
+
+        size = len(real_values)
+        if eval_time * size < self.parallel_threshold:
+            self.timings = {"serial": eval_time * size}
+            self._evaluator = SerialEvaluator(self.timeout)
+            return
+
+        chunk_size = math.ceil(self.min_task_time / max(eval_time, 1e-9))
+        chunk_size = min(max(chunk_size, 1), math.ceil(size / self.max_workers))
+
+        # A sample giving every worker one chunk
+        sample = real_values[:chunk_size * self.max_workers]
+        self.timings = {"serial": eval_time * len(sample)}
+        candidates = {"serial": SerialEvaluator(self.timeout)}
+
+        parallel_candidates = [ProcessPoolEvaluator(self.max_workers, chunk_size, self.adaptive_chunking,
+                                                    timeout=self.timeout)]
+        if self.timeout is None:
+            parallel_candidates.insert(0, ThreadPoolEvaluator(self.max_workers, chunk_size, self.adaptive_chunking))
+
+        for candidate in parallel_candidates:
+            try:
+                candidate.start(fitness_fun)
+                start_time = time.perf_counter()
+                candidate.evaluate(fitness_fun, sample)
+                self.timings[candidate.name] = time.perf_counter() - start_time
+                candidates[candidate.name] = candidate
+            except Exception as e:
+                # e.g. a function which can't be pickled for worker processes
+                print(f"AutoEvaluator: {candidate.name} backend skipped ({type(e).__name__}: {e})")
+                candidate.shutdown()
+
+        best_name = min(candidates, key=lambda name: self.timings[name])
+        for name, candidate in candidates.items():
+            if name != best_name:
+                candidate.shutdown()
+        self._evaluator = candidates[best_name]
+
+        # Statistics should not include the timed sample, it is evaluated again
+        self._evaluator.reset_statistics()
+
+    def start(self, fitness_fun: FitnessFunctionBase = None):
+        if self._evaluator is not None and fitness_fun is self._fitness_fun:
+            self._evaluator.start(fitness_fun)
+
+    def shutdown(self):
+        if self._evaluator is not None:
+            self._evaluator.shutdown()
+
+    @property
+    def nr_of_workers(self):
+        return self.max_workers if self._evaluator is None else self._evaluator.nr_of_workers
+
+    def failure_counts(self):
+        # Failures recorded by the wrapper itself and by the chosen backend
+        failure_counts = super().failure_counts()
+        if self._evaluator is not None:
+            for kind, count in self._evaluator.failure_counts().items():
+                failure_counts[kind] += count
+        return failure_counts
+
+    def reset_statistics(self):
+        super().reset_statistics()
+        if self._evaluator is not None:
+            self._evaluator.reset_statistics()
+
+    def describe(self):
+        description = {"backend": None} if self._evaluator is None else self._evaluator.describe()
+        if self._is_awaited:
+            description["backend"] = "async"
+        return {**description, "failures": self.failure_counts(), "tuned_by": self.name,
+                "timings": dict(self.timings)}
+
+    def evaluate(self, fitness_fun: FitnessFunctionBase, real_values) -> np.ndarray:
+        if self._evaluator is None or fitness_fun is not self._fitness_fun:
+            self.tune(fitness_fun, real_values)
+
+        return self._evaluator.evaluate(fitness_fun, real_values)
+
+    def submit(self, fitness_fun: FitnessFunctionBase, real_values):
+        if self._evaluator is None or fitness_fun is not self._fitness_fun:
+            self.tune(fitness_fun, real_values)
+
+        return self._evaluator.submit(fitness_fun, real_values)
+
+    async def evaluate_async(self, fitness_fun: FitnessFunctionBase, real_values) -> np.ndarray:
+        if not fitness_fun.is_async:
+            # Evaluated by `evaluate` in a thread, which tunes the backend
+            return await super().evaluate_async(fitness_fun, real_values)
+
+        if self._evaluator is None or fitness_fun is not self._fitness_fun:
+            # Awaited on the event loop, there is no backend to time
+            self.shutdown()
+            self.timings = {}
+            self._fitness_fun = fitness_fun
+            self._is_awaited = True
+            self._evaluator = SerialEvaluator(self.timeout)
+
+        return await self._evaluator.evaluate_async(fitness_fun, real_values)
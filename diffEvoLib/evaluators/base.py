@@ -0,0 +1,353 @@
+import asyncio
+import concurrent.futures
+import math
+import os
+import signal
+import threading
+import time
+import numpy as np
+from abc import ABC, abstractmethod
+from collections import defaultdict
+
+from diffEvoLib.models.fitness_function import FitnessFunctionBase, RowEvaluationError
+
+
+class EvaluationTimeout(BaseException):
+    """
+    Raised inside an evaluation running longer than the timeout. Derived from BaseException, so it is not
+    swallowed by `except Exception` blocks of the fitness function.
+    """
+    pass
+
+
+def _raise_evaluation_timeout(signum, frame):
+    raise EvaluationTimeout()
+
+
+def call_with_timeout(func, timeout, *args):
+    """
+    Calls `func(*args)` and interrupts it with EvaluationTimeout after `timeout` seconds.
+
+    The timeout relies on SIGALRM, so it is only enforced in the main thread on Unix (which includes the
+    worker processes of a process pool), otherwise `func` runs without a limit. Code which does not return
+    to the interpreter (e.g. a blocking C call) is interrupted only once it does.
+    """
+    if timeout is None or not hasattr(signal, "SIGALRM") or threading.current_thread() is not threading.main_thread():
+        return func(*args)
+
+    previous_handler = signal.signal(signal.SIGALRM, _raise_evaluation_timeout)
+    signal.setitimer(signal.ITIMER_REAL, timeout)
+    try:
+        return func(*args)
+    finally:
+        signal.setitimer(signal.ITIMER_REAL, 0)
+        signal.signal(signal.SIGALRM, previous_handler)
+
+
+def evaluate_chunk(fitness_fun: FitnessFunctionBase, real_values, timeout=None):
+    """
+    Evaluates a chunk of rows. Defined at module level, so it can be sent to worker processes.
+
+    A row which raises or runs longer than `timeout` seconds gets NaN as its fitness value instead of
+    failing the whole chunk. Vectorized functions are first called on the whole chunk (with a timeout
+    scaled by its length) and only evaluated row by row when that call fails, other functions are evaluated
+    row by row, so a failing row doesn't make the rows before it run again.
+
+    :return: Fitness vector, number of rows which raised and number of rows which timed out.
+    """
+    if fitness_fun.vectorized:
+        try:
+            batch_timeout = None if timeout is None else timeout * len(real_values)
+            return call_with_timeout(fitness_fun.eval_batch, batch_timeout, real_values), 0, 0
+        except RowEvaluationError as e:
+            # The function isolated the failed rows itself
+            return e.fitness_values, e.nr_of_errors, e.nr_of_timeouts
+        except (Exception, EvaluationTimeout):
+            pass
+
+    # Evaluate the rows one by one, so only the failing ones are lost
+    fitness_values = np.full(len(real_values), np.nan)
+    nr_of_errors, nr_of_timeouts = 0, 0
+    for i, params in enumerate(real_values):
+        try:
+            fitness_values[i] = call_with_timeout(fitness_fun.eval, timeout, params)
+        except EvaluationTimeout:
+            nr_of_timeouts += 1
+        except RowEvaluationError as e:
+            nr_of_errors += e.nr_of_errors
+            nr_of_timeouts += e.nr_of_timeouts
+        except Exception:
+            nr_of_errors += 1
+    return fitness_values, nr_of_errors, nr_of_timeouts
+
+
+def evaluate_timed_chunk(fitness_fun: FitnessFunctionBase, real_values, timeout=None):
+    """
+    Evaluates a chunk of rows like `evaluate_chunk` and also reports which worker did it and how long it took.
+    """
+    start_time = time.perf_counter()
+    fitness_values, nr_of_errors, nr_of_timeouts = evaluate_chunk(fitness_fun, real_values, timeout)
+    worker_id = f"{os.getpid()}:{threading.current_thread().name}"
+    return fitness_values, nr_of_errors, nr_of_timeouts, worker_id, time.perf_counter() - start_time
+
+
+async def evaluate_chunk_async(fitness_fun: FitnessFunctionBase, real_values, timeout=None):
+    """
+    Evaluates the rows of an async fitness function on the running event loop, isolating failures
+    like `evaluate_chunk`.
+
+    :return: Fitness vector, number of rows which raised and number of rows which timed out.
+    """
+    results = await fitness_fun.eval_batch_async(real_values, timeout, return_exceptions=True)
+
+    fitness_values = np.full(len(real_values), np.nan)
+    nr_of_errors, nr_of_timeouts = 0, 0
+    for i, result in enumerate(results):
+        if isinstance(result, asyncio.TimeoutError):
+            nr_of_timeouts += 1
+        elif isinstance(result, Exception):
+            nr_of_errors += 1
+        elif isinstance(result, BaseException):
+            # e.g. cancellation of the run
+            raise result
+        else:
+            fitness_values[i] = result
+    return fitness_values, nr_of_errors, nr_of_timeouts
+
+
+class BaseEvaluator(ABC):
+    name = ""
+
+    def __init__(self, chunk_size=None, timeout=None):
+        """
+        :param chunk_size: Number of rows evaluated by a single task. By default the rows are split evenly
+                           between the workers.
+        :param timeout: Time limit (seconds) of a single evaluation. Rows which raise or time out get NaN
+                        as their fitness value and are counted in `failure_counts`.
+        """
+        self.chunk_size = chunk_size
+        self.timeout = timeout
+        self._failures = {"errors": 0, "timeouts": 0, "worker_crashes": 0}
+
+    def start(self, fitness_fun: FitnessFunctionBase = None):
+        """
+        Prepares the backend (e.g. starts its worker pool) before the first evaluation. Backends with workers
+        keep them running until `shutdown`, so they are reused by all epochs and by consecutive runs.
+
+        :param fitness_fun: Function the workers can be prepared for.
+        """
+        pass
+
+    def shutdown(self):
+        pass
+
+    @property
+    def nr_of_workers(self):
+        """
+        Number of evaluations the backend runs at the same time.
+        """
+        return 1
+
+    def describe(self):
+        """
+        :return: Description of the backend, recorded in the run metadata.
+        """
+        return {"backend": self.name, "chunk_size": self.chunk_size, "timeout": self.timeout,
+                "failures": self.failure_counts()}
+
+    def failure_counts(self):
+        """
+        :return: Number of evaluations which raised, timed out or crashed their worker since the last reset.
+        """
+        return dict(self._failures)
+
+    def record_failures(self, nr_of_errors=0, nr_of_timeouts=0, nr_of_worker_crashes=0):
+        self._failures["errors"] += nr_of_errors
+        self._failures["timeouts"] += nr_of_timeouts
+        self._failures["worker_crashes"] += nr_of_worker_crashes
+
+    def reset_statistics(self):
+        self._failures = {"errors": 0, "timeouts": 0, "worker_crashes": 0}
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.shutdown()
+
+    @abstractmethod
+    def evaluate(self, fitness_fun: FitnessFunctionBase, real_values) -> np.ndarray:
+        """
+        :param fitness_fun: Function evaluating the rows.
+        :param real_values: Matrix with one parameter vector per row.
+        :return: Fitness vector with the values in row order and NaN for rows which failed.
+        """
+        pass
+
+    async def evaluate_async(self, fitness_fun: FitnessFunctionBase, real_values) -> np.ndarray:
+        """
+        Coroutine version of `evaluate`. Async fitness functions are awaited on the running event loop,
+        with at most their `max_concurrency` evaluations at a time. Other functions are evaluated by `evaluate`
+        in a thread, so the event loop is not blocked.
+        """
+        if not fitness_fun.is_async:
+            return await asyncio.get_running_loop().run_in_executor(None, self.evaluate, fitness_fun, real_values)
+
+        fitness_values, nr_of_errors, nr_of_timeouts = await evaluate_chunk_async(fitness_fun, real_values,
+                                                                                  self.timeout)
+        self.record_failures(nr_of_errors, nr_of_timeouts)
+        return fitness_values
+
+    def submit(self, fitness_fun: FitnessFunctionBase, real_values) -> concurrent.futures.Future:
+        """
+        Starts evaluating the rows without waiting for them. Backends without workers evaluate right away.
+
+        :return: Future of the fitness vector. It fails as a whole only when the evaluation couldn't run
+                 (e.g. its worker crashed), rows which failed on their own get NaN like in `evaluate`.
+        """
+        future = concurrent.futures.Future()
+        try:
+            future.set_result(self.evaluate(fitness_fun, real_values))
+        except Exception as e:
+            future.set_exception(e)
+        return future
+
+
+class BasePoolEvaluator(BaseEvaluator, ABC):
+    """
+    Base of backends evaluating chunks of rows in a pool of workers.
+    """
+
+    def __init__(self, max_workers=None, chunk_size=None, adaptive_chunking=False, min_chunk_size=1, timeout=None):
+        """
+        :param max_workers: Number of workers, the number of CPUs by default.
+        :param chunk_size: Number of rows evaluated by a single task. By default the rows are split evenly
+                           between the workers. With adaptive chunking it is the size of the largest chunk.
+        :param adaptive_chunking: Whether chunks start large and shrink as the rows run out (guided scheduling),
+                                  so workers finishing early pick up the small chunks left at the end
+                                  instead of waiting for a straggler.
+        :param min_chunk_size: Size of the smallest chunk with adaptive chunking.
+        :param timeout: Time limit (seconds) of a single evaluation.
+        """
+        super().__init__(chunk_size, timeout)
+        self.max_workers = max_workers if max_workers is not None else (os.cpu_count() or 1)
+        self.adaptive_chunking = adaptive_chunking
+        self.min_chunk_size = min_chunk_size
+
+        # Busy time of every worker and total time spent in `evaluate` or with submitted tasks running
+        self._busy_times = defaultdict(float)
+        self._wall_time = 0.0
+        self._nr_of_running_tasks = 0
+        self._running_since = 0.0
+        # Submitted tasks are completed in pool threads
+        self._statistics_lock = threading.Lock()
+
+    @property
+    def nr_of_workers(self):
+        return self.max_workers
+
+    @abstractmethod
+    def submit_chunk(self, fitness_fun: FitnessFunctionBase, real_values) -> concurrent.futures.Future:
+        """
+        Submits a single task evaluating the rows.
+
+        :return: Future of the timed chunk result (see `evaluate_timed_chunk`).
+        """
+        pass
+
+    def submit(self, fitness_fun: FitnessFunctionBase, real_values) -> concurrent.futures.Future:
+        future = concurrent.futures.Future()
+        with self._statistics_lock:
+            if self._nr_of_running_tasks == 0:
+                self._running_since = time.perf_counter()
+            self._nr_of_running_tasks += 1
+
+        try:
+            task = self.submit_chunk(fitness_fun, real_values)
+        except BaseException:
+            # The task never runs, so it is not counted as running
+            with self._statistics_lock:
+                self._nr_of_running_tasks -= 1
+            raise
+        task.add_done_callback(lambda finished_task: self._complete_submitted(finished_task, future))
+        return future
+
+    def _complete_submitted(self, task: concurrent.futures.Future, future: concurrent.futures.Future):
+        with self._statistics_lock:
+            self._nr_of_running_tasks -= 1
+            # Time with no task running is not counted, so utilization is not lowered by the caller
+            wall_time = 0.0
+            if self._nr_of_running_tasks == 0:
+                wall_time = time.perf_counter() - self._running_since
+
+        try:
+            result = task.result()
+        except Exception as e:
+            future.set_exception(e)
+            return
+
+        self.record_results([result], wall_time)
+        future.set_result(result[0])
+
+    def describe(self):
+        return {
+            **super().describe(),
+            "max_workers": self.max_workers,
+            "adaptive_chunking": self.adaptive_chunking,
+            "utilization": self.utilization()
+        }
+
+    def split_into_ranges(self, size):
+        """
+        :return: (start, stop) row ranges of the chunks of a matrix with `size` rows.
+        """
+        if not self.adaptive_chunking:
+            chunk_size = self.chunk_size if self.chunk_size is not None else math.ceil(size / self.max_workers)
+            chunk_size = max(chunk_size, 1)
+            return [(start, min(start + chunk_size, size)) for start in range(0, size, chunk_size)]
+
+        ranges = []
+        start = 0
+        while start < size:
+            chunk_size = max(math.ceil((size - start) / (2 * self.max_workers)), self.min_chunk_size, 1)
+            if self.chunk_size is not None:
+                chunk_size = min(chunk_size, self.chunk_size)
+            ranges.append((start, min(start + chunk_size, size)))
+            start += chunk_size
+        return ranges
+
+    def split_into_chunks(self, real_values):
+        return [real_values[start:stop] for start, stop in self.split_into_ranges(len(real_values))]
+
+    def record_results(self, results, wall_time):
+        """
+        Records the statistics of timed chunk results.
+        """
+        with self._statistics_lock:
+            for _, nr_of_errors, nr_of_timeouts, worker_id, busy_time in results:
+                self.record_failures(nr_of_errors, nr_of_timeouts)
+                # Rows lost with a crashed worker have no worker to account for
+                if worker_id is not None:
+                    self._busy_times[worker_id] += busy_time
+            self._wall_time += wall_time
+
+    def collect_results(self, results, wall_time):
+        """
+        Records the statistics of the timed chunk results and joins their fitness values in order.
+        """
+        self.record_results(results, wall_time)
+        return np.concatenate([result[0] for result in results])
+
+    def utilization(self):
+        """
+        :return: Fraction of the evaluation time every worker spent evaluating.
+        """
+        if self._wall_time == 0.0:
+            return {}
+        return {worker_id: busy_time / self._wall_time for worker_id, busy_time in self._busy_times.items()}
+
+    def reset_statistics(self):
+        super().reset_statistics()
+        self._busy_times.clear()
+        self._wall_time = 0.0
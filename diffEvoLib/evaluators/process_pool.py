@@ -0,0 +1,212 @@
+import concurrent.futures
+import os
+import time
+import numpy as np
+from concurrent.futures.process import BrokenProcessPool
+from multiprocessing import resource_tracker
+
+from diffEvoLib.evaluators.base import BasePoolEvaluator, evaluate_timed_chunk
+from diffEvoLib.helpers.shared_memory_helper import SharedArray
+from diffEvoLib.models.fitness_function import FitnessFunctionBase
+
+# Fitness function of the current worker process, sent once by the pool initializer
+_worker_fitness_fun = None
+# Shared arrays the current worker process is attached to, by name
+_worker_shared_arrays = {}
+
+
+def _init_worker(fitness_fun: FitnessFunctionBase):
+    global _worker_fitness_fun
+    _worker_fitness_fun = fitness_fun
+
+
+def _evaluate_in_worker(real_values, timeout):
+    return evaluate_timed_chunk(_worker_fitness_fun, real_values, timeout)
+
+
+def _get_worker_shared_array(spec):
+    name = spec[0]
+    if name not in _worker_shared_arrays:
+        _worker_shared_arrays[name] = SharedArray.attach(spec)
+    return _worker_shared_arrays[name].array
+
+
+def _evaluate_range_in_worker(input_spec, output_spec, start, stop, timeout):
+    # Drop the blocks of earlier evaluations, which are replaced when they are too small
+    for name in set(_worker_shared_arrays) - {input_spec[0], output_spec[0]}:
+        _worker_shared_arrays.pop(name).close()
+
+    real_values = _get_worker_shared_array(input_spec)
+    fitness_values = _get_worker_shared_array(output_spec)
+
+    result = evaluate_timed_chunk(_worker_fitness_fun, real_values[start:stop], timeout)
+    fitness_values[start:stop] = result[0]
+    # Fitness values are already in the output block and are not sent back
+    return None, *result[1:]
+
+
+def _warm_up():
+    return os.getpid()
+
+
+class ProcessPoolEvaluator(BasePoolEvaluator):
+    """
+    Evaluates chunks of rows in worker processes, so pure Python functions are not serialized by the GIL.
+    The fitness function has to be picklable (e.g. defined at module level, not a lambda).
+
+    Workers are started once for a fitness function, which is sent to every worker a single time, and are reused
+    by all epochs and by consecutive runs until `shutdown`. Evaluating a different function restarts the pool.
+
+    Rows which raise or time out get NaN as their fitness value. When a worker dies (e.g. the function
+    crashes the interpreter), the pool is restarted and the lost rows are evaluated again one per task,
+    so only the row which crashed its worker gets NaN.
+
+    With `shared_memory` the matrix is copied once into a shared memory block, which the workers read
+    in place, and they write the fitness values straight into a shared output block. Tasks only carry row
+    ranges, so nothing proportional to the matrix size is pickled, which matters for matrices with
+    millions of elements. The blocks are reused by all evaluations and removed by `shutdown`.
+    """
+    name = "process"
+
+    def __init__(self, max_workers=None, chunk_size=None, adaptive_chunking=False, min_chunk_size=1, timeout=None,
+                 shared_memory=False):
+        super().__init__(max_workers, chunk_size, adaptive_chunking, min_chunk_size, timeout)
+        self.shared_memory = shared_memory
+        self._executor = None
+        self._fitness_fun = None
+
+        # Shared input matrix and output fitness vector, used with `shared_memory`
+        self._shared_input: SharedArray = None
+        self._shared_output: SharedArray = None
+
+    def start(self, fitness_fun: FitnessFunctionBase = None):
+        if fitness_fun is None or (self._executor is not None and fitness_fun is self._fitness_fun):
+            return
+
+        self.shutdown()
+        if self.shared_memory:
+            # Workers have to share the resource tracker of this process, so the blocks they attach to
+            # are tracked once and not removed when a worker exits
+            resource_tracker.ensure_running()
+        self._executor = concurrent.futures.ProcessPoolExecutor(
+            max_workers=self.max_workers,
+            initializer=_init_worker,
+            initargs=(fitness_fun,)
+        )
+        self._fitness_fun = fitness_fun
+
+        # Spawn the workers now, so process start-up is not paid by the first epoch
+        for future in [self._executor.submit(_warm_up) for _ in range(self.max_workers)]:
+            future.result()
+
+    def shutdown(self):
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+            self._executor = None
+            self._fitness_fun = None
+        self._release_shared_arrays()
+
+    def describe(self):
+        return {**super().describe(), "shared_memory": self.shared_memory}
+
+    def _release_shared_arrays(self):
+        for shared_array in [self._shared_input, self._shared_output]:
+            if shared_array is not None:
+                shared_array.unlink()
+        self._shared_input, self._shared_output = None, None
+
+    def _prepare_shared_arrays(self, real_values):
+        """
+        Copies the matrix into the shared input block, which is replaced by a larger one when needed.
+        """
+        size, arg_num = real_values.shape
+        if self._shared_input is None or self._shared_input.shape[1] != arg_num \
+                or self._shared_input.shape[0] < size:
+            self._release_shared_arrays()
+            self._shared_input = SharedArray((size, arg_num))
+            self._shared_output = SharedArray((size,))
+
+        np.copyto(self._shared_input.array[:size], real_values)
+
+    def evaluate(self, fitness_fun: FitnessFunctionBase, real_values) -> np.ndarray:
+        if len(real_values) == 0:
+            return np.empty(0)
+
+        self.start(fitness_fun)
+        ranges = self.split_into_ranges(len(real_values))
+        chunks = [real_values[start:stop] for start, stop in ranges]
+
+        start_time = time.perf_counter()
+        if self.shared_memory:
+            self._prepare_shared_arrays(real_values)
+            input_spec, output_spec = self._shared_input.spec(), self._shared_output.spec()
+            futures = [self._submit(_evaluate_range_in_worker, input_spec, output_spec, start, stop, self.timeout)
+                       for start, stop in ranges]
+        else:
+            futures = [self._submit(_evaluate_in_worker, chunk, self.timeout) for chunk in chunks]
+
+        # Results are collected in submission order, a chunk lost with a broken pool is left as None
+        results = []
+        for (start, stop), future in zip(ranges, futures):
+            try:
+                result = future.result()
+            except BrokenProcessPool:
+                results.append(None)
+                continue
+
+            if self.shared_memory:
+                result = (self._shared_output.array[start:stop].copy(), *result[1:])
+            results.append(result)
+
+        if any(result is None for result in results):
+            results = self._recover_lost_chunks(fitness_fun, chunks, results)
+        return self.collect_results(results, time.perf_counter() - start_time)
+
+    def submit_chunk(self, fitness_fun: FitnessFunctionBase, real_values) -> concurrent.futures.Future:
+        # Submitted rows are sent with the task, also with `shared_memory`, as they are meant to be few
+        self.start(fitness_fun)
+        return self._submit(_evaluate_in_worker, real_values, self.timeout)
+
+    def _submit(self, fn, *args):
+        # The pool may break while tasks are submitted, such a task gets a future failed the same way
+        try:
+            return self._executor.submit(fn, *args)
+        except BrokenProcessPool as e:
+            future = concurrent.futures.Future()
+            future.set_exception(e)
+            return future
+
+    def _restart(self, fitness_fun: FitnessFunctionBase):
+        self.shutdown()
+        self.start(fitness_fun)
+
+    def _recover_lost_chunks(self, fitness_fun: FitnessFunctionBase, chunks, results):
+        """
+        Restarts the broken pool and evaluates the rows of the lost chunks again, one row per task.
+        Rows lost again are evaluated alone, to tell the row crashing its worker from the ones lost with the pool.
+        """
+        self._restart(fitness_fun)
+
+        recovered_results = []
+        for chunk, result in zip(chunks, results):
+            if result is not None:
+                recovered_results.append(result)
+                continue
+
+            rows = [chunk[i:i + 1] for i in range(len(chunk))]
+            futures = [self._submit(_evaluate_in_worker, row, self.timeout) for row in rows]
+            for row, future in zip(rows, futures):
+                try:
+                    recovered_results.append(future.result())
+                except BrokenProcessPool:
+                    self._restart(fitness_fun)
+                    recovered_results.append(self._evaluate_alone(fitness_fun, row))
+        return recovered_results
+
+    def _evaluate_alone(self, fitness_fun: FitnessFunctionBase, row):
+        try:
+            return self._submit(_evaluate_in_worker, row, self.timeout).result()
+        except BrokenProcessPool:
+            self.record_failures(nr_of_worker_crashes=len(row))
+            self._restart(fitness_fun)
+            return np.full(len(row), np.nan), 0, 0, None, 0.0
@@ -0,0 +1,26 @@
+import numpy as np
+
+from diffEvoLib.evaluators.base import BaseEvaluator, evaluate_chunk
+from diffEvoLib.models.fitness_function import FitnessFunctionBase
+
+
+class SerialEvaluator(BaseEvaluator):
+    """
+    Evaluates the matrix in the calling thread, vectorized functions with a single `eval_batch` call
+    and other functions row by row.
+    """
+    name = "serial"
+
+    def __init__(self, timeout=None):
+        super().__init__(timeout=timeout)
+        self._vectorized = False
+
+    def evaluate(self, fitness_fun: FitnessFunctionBase, real_values) -> np.ndarray:
+        self._vectorized = fitness_fun.vectorized
+        fitness_values, nr_of_errors, nr_of_timeouts = evaluate_chunk(fitness_fun, real_values, self.timeout)
+        self.record_failures(nr_of_errors, nr_of_timeouts)
+        return fitness_values
+
+    def describe(self):
+        # Serial evaluation of a vectorized function is a single call on the whole matrix
+        return {**super().describe(), "backend": "vectorized" if self._vectorized else self.name}
@@ -0,0 +1,47 @@
+import concurrent.futures
+import time
+import numpy as np
+
+from diffEvoLib.evaluators.base import BasePoolEvaluator, evaluate_chunk, evaluate_timed_chunk
+from diffEvoLib.models.fitness_function import FitnessFunctionBase
+
+
+class ThreadPoolEvaluator(BasePoolEvaluator):
+    """
+    Evaluates chunks of rows in worker threads. Only pays off for functions releasing the GIL.
+    The pool is created on first use and reused until `shutdown`.
+
+    Rows which raise get NaN as their fitness value, but threads can't be interrupted, so evaluation
+    timeouts are not supported (use the serial or process backend instead).
+    """
+    name = "thread"
+
+    def __init__(self, max_workers=None, chunk_size=None, adaptive_chunking=False, min_chunk_size=1):
+        super().__init__(max_workers, chunk_size, adaptive_chunking, min_chunk_size)
+        self._executor = None
+
+    def start(self, fitness_fun: FitnessFunctionBase = None):
+        if self._executor is None:
+            self._executor = concurrent.futures.ThreadPoolExecutor(max_workers=self.max_workers)
+
+    def shutdown(self):
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+            self._executor = None
+
+    def evaluate(self, fitness_fun: FitnessFunctionBase, real_values) -> np.ndarray:
+        if fitness_fun.vectorized or len(real_values) <= 1:
+            fitness_values, nr_of_errors, nr_of_timeouts = evaluate_chunk(fitness_fun, real_values)
+            self.record_failures(nr_of_errors, nr_of_timeouts)
+            return fitness_values
+
+        self.start()
+        chunks = self.split_into_chunks(real_values)
+
+        start_time = time.perf_counter()
+        results = list(self._executor.map(evaluate_timed_chunk, [fitness_fun] * len(chunks), chunks))
+        return self.collect_results(results, time.perf_counter() - start_time)
+
+    def submit_chunk(self, fitness_fun: FitnessFunctionBase, real_values) -> concurrent.futures.Future:
+        self.start()
+        return self._executor.submit(evaluate_timed_chunk, fitness_fun, real_values)
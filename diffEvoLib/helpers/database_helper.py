@@ -25,9 +25,9 @@ def format_individuals(individuals: typing.List[Metric]):
         formatted_individuals.append(
             (
                 epoch,
-                json.dumps([chromosome.real_value for chromosome in best_member.chromosomes]),
+                json.dumps(best_member.get_chromosomes()),
                 best_member.fitness_value,
-                json.dumps([chromosome.real_value for chromosome in worst_member.chromosomes]),
+                json.dumps(worst_member.get_chromosomes()),
                 worst_member.fitness_value,
                 mean,
                 std,
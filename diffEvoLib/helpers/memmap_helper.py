@@ -0,0 +1,25 @@
+import os
+import tempfile
+import numpy as np
+
+
+def create_matrix(shape, storage_dir=None):
+    """
+    Allocates an uninitialized float matrix, in memory or as a `numpy.memmap` backed by a temporary file.
+
+    :param shape: Shape of the matrix.
+    :param storage_dir: Directory of the file backing the matrix, the matrix is in memory when not given.
+    """
+    if storage_dir is None:
+        return np.empty(shape)
+
+    file_descriptor, path = tempfile.mkstemp(suffix='.dat', prefix='population_', dir=storage_dir)
+    os.close(file_descriptor)
+    matrix = np.memmap(path, dtype=float, mode='w+', shape=shape)
+    try:
+        # The mapping stays valid, the disk space is released with the last reference to the matrix
+        os.unlink(path)
+    except OSError:
+        # e.g. on Windows, where mapped files can't be removed, the file is left in `storage_dir`
+        pass
+    return matrix
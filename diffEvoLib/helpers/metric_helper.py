@@ -1,17 +1,29 @@
 import time
+import numpy as np
 from dataclasses import dataclass
 
+from diffEvoLib.models.enums.optimization import OptimizationType
 from diffEvoLib.models.member import Member
 from diffEvoLib.models.population import Population
 
 
 class MetricHelper:
 
+    @staticmethod
+    def get_best_worst_indices(fitness_values, optimization: OptimizationType, axis=None):
+        """
+        :return: Indices of the best and the worst fitness values according to the optimization type.
+        """
+        if optimization == OptimizationType.MINIMIZATION:
+            return np.argmin(fitness_values, axis=axis), np.argmax(fitness_values, axis=axis)
+        return np.argmax(fitness_values, axis=axis), np.argmin(fitness_values, axis=axis)
+
     @staticmethod
     def calculate_metrics(population: Population, start_time, epoch):
-        sorted_members = population.get_best_members(population.size)
-        best_inv = sorted_members[0]
-        worst_inv = sorted_members[-1]
+        best_index, worst_index = MetricHelper.get_best_worst_indices(population.fitness_values,
+                                                                      population.optimization)
+        best_inv = population.get_member(best_index)
+        worst_inv = population.get_member(worst_index)
 
         # Metrics
         pop_mean = population.mean()
@@ -31,6 +43,32 @@ class MetricHelper:
 
         return metric
 
+    @staticmethod
+    def combine_metrics(metrics, population_sizes, optimization: OptimizationType):
+        """
+        Metric of the union of populations, e.g. the islands of `IslandModel`, from their metrics of one epoch.
+        """
+        sizes = np.asarray(population_sizes, dtype=float)
+        means = np.array([metric.population_mean for metric in metrics])
+        stds = np.array([metric.population_std for metric in metrics])
+
+        # Pooled mean and standard deviation of all members
+        pop_mean = np.sum(sizes * means) / np.sum(sizes)
+        pop_std = np.sqrt(np.sum(sizes * (stds ** 2 + (means - pop_mean) ** 2)) / np.sum(sizes))
+
+        best_fun, worst_fun = (min, max) if optimization == OptimizationType.MINIMIZATION else (max, min)
+        best_inv = best_fun((metric.best_individual for metric in metrics), key=lambda member: member.fitness_value)
+        worst_inv = worst_fun((metric.worst_individual for metric in metrics), key=lambda member: member.fitness_value)
+
+        return Metric(
+            epoch=metrics[0].epoch,
+            best_individual=best_inv,
+            worst_individual=worst_inv,
+            population_mean=float(pop_mean),
+            population_std=float(pop_std),
+            execution_time=max(metric.execution_time for metric in metrics)
+        )
+
 
 @dataclass
 class Metric:
@@ -0,0 +1,36 @@
+import numpy as np
+
+
+def sample_distinct_indices(size, k, exclude_self=False, rng: np.random.Generator = None, targets=None):
+    """
+    Draws `k` mutually distinct indices from range(size) for each of `size` rows (or `targets`) at once.
+
+    Each column is drawn from the range that is still available and then shifted over the indices
+    already taken in its row, so no rejection sampling or per-row Python loop is needed.
+
+    :param size: Number of rows and size of the index range (the population size).
+    :param k: Number of distinct indices per row.
+    :param exclude_self: Whether the row of target `i` must not contain index `i`.
+    :param rng: Random generator, a new one is created when not given.
+    :param targets: Indices the rows are drawn for, all of range(size) by default.
+    :return: Integer matrix of shape (len(targets), k).
+    """
+    rng = np.random.default_rng() if rng is None else rng
+    targets = np.arange(size) if targets is None else np.asarray(targets, dtype=np.intp)
+    nr_of_rows = len(targets)
+
+    taken = targets.reshape(-1, 1) if exclude_self else np.empty((nr_of_rows, 0), dtype=np.intp)
+    available = size - taken.shape[1]
+    if k > available:
+        raise ValueError(f"Cannot sample {k} distinct indices from {available} available.")
+
+    indices = np.empty((nr_of_rows, k), dtype=np.intp)
+    for j in range(k):
+        column = rng.integers(0, available - j, size=nr_of_rows)
+        for taken_column in np.sort(taken, axis=1).T:
+            column += column >= taken_column
+
+        indices[:, j] = column
+        taken = np.column_stack((taken, column))
+
+    return indices
@@ -0,0 +1,58 @@
+import numpy as np
+from multiprocessing import shared_memory
+
+
+class SharedArray:
+    """
+    Numpy array stored in a `multiprocessing.shared_memory` block, so other processes can attach to it
+    by name and read or write it without copying.
+    """
+
+    def __init__(self, shape, dtype=float, name=None):
+        """
+        :param shape: Shape of the array.
+        :param dtype: Type of the array elements.
+        :param name: Name of an existing block to attach to. When not given a new block is created,
+                     which is owned by this object and removed by `unlink`.
+        """
+        self.shape = tuple(shape)
+        self.dtype = np.dtype(dtype)
+        self.is_owner = name is None
+
+        nr_of_bytes = max(int(np.prod(self.shape)) * self.dtype.itemsize, 1)
+        # Attaching is meant for child processes (e.g. pool workers), which share the resource tracker
+        # of their parent, so the block is tracked once and removed by its creator
+        self._shm = shared_memory.SharedMemory(name=name, create=self.is_owner, size=nr_of_bytes)
+
+        self.name = self._shm.name
+        self.array = np.ndarray(self.shape, dtype=self.dtype, buffer=self._shm.buf)
+
+    def spec(self):
+        """
+        :return: Picklable description of the array, from which other processes attach to it with `attach`.
+        """
+        return self.name, self.shape, self.dtype.str
+
+    @staticmethod
+    def attach(spec):
+        name, shape, dtype = spec
+        return SharedArray(shape, dtype, name=name)
+
+    def close(self):
+        """
+        Detaches this process from the block. Views of `array` must not be used afterwards.
+        """
+        self.array = None
+        try:
+            self._shm.close()
+        except BufferError:
+            # Views of the array still exist, the mapping is released together with the last of them
+            pass
+
+    def unlink(self):
+        """
+        Closes the block and, when this object created it, removes it from the system.
+        """
+        self.close()
+        if self.is_owner:
+            self._shm.unlink()
@@ -4,6 +4,7 @@ from abc import ABC, abstractmethod
 
 
 class BaseChromosome(ABC):
+    __slots__ = ()
 
     @abstractmethod
     def calculate_real_value(self, bin_ind):
@@ -11,12 +12,37 @@ class BaseChromosome(ABC):
 
 
 class Chromosome(BaseChromosome):
-    def __init__(self, interval):
+    __slots__ = ('interval', '_real_values', '_index')
+
+    def __init__(self, interval, real_values=None, index=0, random_init=True):
+        """
+        :param interval: Lower and upper bound of the chromosome.
+        :param real_values: Optional array the chromosome is a view of (e.g. a member row). When not given
+                            the chromosome owns a single value.
+        :param index: Position of the chromosome in `real_values`.
+        :param random_init: Whether an owned value is drawn from the interval. When False the value is set
+                            to zero and no random number is drawn, which is meant for temporary chromosomes.
+        """
         # Options
         self.interval = interval
 
-        # Real value
-        self.real_value = np.random.uniform(self.interval[0], self.interval[1])
+        # Real value storage
+        if real_values is None:
+            if random_init:
+                real_values = np.array([np.random.uniform(self.interval[0], self.interval[1])])
+            else:
+                real_values = np.zeros(1)
+            index = 0
+        self._real_values = real_values
+        self._index = index
+
+    @property
+    def real_value(self):
+        return self._real_values[self._index]
+
+    @real_value.setter
+    def real_value(self, value):
+        self._real_values[self._index] = value
 
     def calculate_real_value(self, bin_ind):
         binary_string = ''.join([str(elem) for elem in bin_ind])
@@ -24,21 +50,21 @@ class Chromosome(BaseChromosome):
             math.pow(2, bin_ind.size) - 1)
 
     def __add__(self, other):
-        c = Chromosome(self.interval)
+        c = Chromosome(self.interval, random_init=False)
         c.real_value = self.real_value + other.real_value
         return c
 
     def __sub__(self, other):
-        c = Chromosome(self.interval)
+        c = Chromosome(self.interval, random_init=False)
         c.real_value = self.real_value - other.real_value
         return c
 
     def __mul__(self, other):
-        c = Chromosome(self.interval)
+        c = Chromosome(self.interval, random_init=False)
         c.real_value = self.real_value * other
         return c
 
     def __abs__(self):
-        c = Chromosome(self.interval)
+        c = Chromosome(self.interval, random_init=False)
         c.real_value = abs(self.real_value)
         return c
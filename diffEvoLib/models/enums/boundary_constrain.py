@@ -1,7 +1,6 @@
+import numpy as np
 from enum import Enum
 
-from diffEvoLib.models.chromosome import Chromosome
-from diffEvoLib.models.member import Member
 from diffEvoLib.models.population import Population
 
 
@@ -9,60 +8,127 @@ class BoundaryFixing(Enum):
     CLIPPING = 'clipping'
     REFLECTION = 'reflection'
     RANDOM = 'random'
+    MIDPOINT = 'midpoint'
+    WRAP = 'wrap'
 
 
 def get_boundary_constraints_fun(fix_type: BoundaryFixing):
     return {
-        BoundaryFixing.CLIPPING: lambda member: boundary_clipping(member),
-        BoundaryFixing.REFLECTION: lambda member: boundary_reflection(member),
-        BoundaryFixing.RANDOM: lambda member: boundary_random(member),
-    }.get(fix_type, lambda: None)
+        BoundaryFixing.CLIPPING: lambda values, lower, upper, parent_values, rng:
+            boundary_clipping(values, lower, upper),
+        BoundaryFixing.REFLECTION: lambda values, lower, upper, parent_values, rng:
+            boundary_reflection(values, lower, upper),
+        BoundaryFixing.RANDOM: lambda values, lower, upper, parent_values, rng:
+            boundary_random(values, lower, upper, rng),
+        BoundaryFixing.MIDPOINT: lambda values, lower, upper, parent_values, rng:
+            boundary_midpoint(values, lower, upper, parent_values),
+        BoundaryFixing.WRAP: lambda values, lower, upper, parent_values, rng:
+            boundary_wrap(values, lower, upper),
+    }[fix_type]
+
+
+def fix_boundary_constraints(population: Population, fix_type: BoundaryFixing, parent_population: Population = None,
+                             rng: np.random.Generator = None):
+    """
+    Fixes all genes of `population` lying beyond their bounds, in place.
+
+    :param population: The population to be modified.
+    :param fix_type: The strategy used for genes beyond the bounds.
+    :param parent_population: Population the modified one was created from, required by MIDPOINT.
+    :param rng: Random generator used by RANDOM, a new one is created when not given.
+    """
+    parent_values = None if parent_population is None else parent_population.real_values
+    fix_boundary_constraints_values(population.real_values, population.lower_bounds, population.upper_bounds,
+                                    fix_type, parent_values, rng=rng)
 
 
-def fix_boundary_constraints(population: Population, fix_type: BoundaryFixing):
+def fix_boundary_constraints_values(real_values, lower_bounds, upper_bounds, fix_type: BoundaryFixing,
+                                    parent_values=None, rng: np.random.Generator = None):
+    """
+    Matrix form of `fix_boundary_constraints`, e.g. for a chunk of population rows. Modifies `real_values` in-place.
+
+    :param parent_values: Matrix `real_values` was created from, required by MIDPOINT.
+    """
+    # Nothing to do if all members are in the interval
+    if np.all((lower_bounds <= real_values) & (real_values <= upper_bounds)):
+        return
+
     boundary_constraints_fun = get_boundary_constraints_fun(fix_type)
+    boundary_constraints_fun(real_values, lower_bounds, upper_bounds, parent_values, rng)
+
+
+# Strategies for fixing members, when they are beyond boundaries. Each of them works on a (N, D) matrix
+# and takes the lower and upper bound of every dimension.
 
-    for member in population.members:
-        # Enter if member not in interval
-        if not member.is_member_in_interval():
-            boundary_constraints_fun(member)
 
+def boundary_clipping(real_values, lower_bounds, upper_bounds):
+    """
+    Modifies `real_values` in-place.
 
-# Strategies for fixing members, when they are beyond boundaries
+    :param real_values: The (N, D) matrix to be modified.
+    :param lower_bounds: Lower bound of every dimension.
+    :param upper_bounds: Upper bound of every dimension.
+    """
+    np.clip(real_values, lower_bounds, upper_bounds, out=real_values)
 
 
-def boundary_clipping(member: Member):
+def boundary_reflection(real_values, lower_bounds, upper_bounds):
     """
-    Modifies the values of `member` in-place.
+    Modifies `real_values` in-place.
 
-    :param member: The member to be modified.
+    :param real_values: The (N, D) matrix to be modified.
+    :param lower_bounds: Lower bound of every dimension.
+    :param upper_bounds: Upper bound of every dimension.
     """
-    for chromosome in member.chromosomes:
-        if chromosome.real_value > chromosome.interval[1]:
-            chromosome.real_value = chromosome.interval[1]
-        elif chromosome.real_value < chromosome.interval[0]:
-            chromosome.real_value = chromosome.interval[0]
+    above, below = real_values > upper_bounds, real_values < lower_bounds
+    np.copyto(real_values, 2 * upper_bounds - real_values, where=above)
+    np.copyto(real_values, 2 * lower_bounds - real_values, where=below)
 
 
-def boundary_reflection(member: Member):
+def boundary_random(real_values, lower_bounds, upper_bounds, rng: np.random.Generator = None):
     """
-    Modifies the values of `member` in-place.
+    Modifies `real_values` in-place.
 
-    :param member: The member to be modified.
+    :param real_values: The (N, D) matrix to be modified.
+    :param lower_bounds: Lower bound of every dimension.
+    :param upper_bounds: Upper bound of every dimension.
+    :param rng: Random generator, a new one is created when not given.
     """
-    for chromosome in member.chromosomes:
-        if chromosome.real_value > chromosome.interval[1]:
-            chromosome.real_value = 2 * chromosome.interval[1] - chromosome.real_value
-        elif chromosome.real_value < chromosome.interval[0]:
-            chromosome.real_value = 2 * chromosome.interval[0] - chromosome.real_value
+    rng = np.random.default_rng() if rng is None else rng
+
+    rows, columns = np.nonzero((real_values < lower_bounds) | (real_values > upper_bounds))
+    real_values[rows, columns] = rng.uniform(lower_bounds[columns], upper_bounds[columns])
+
+
+def boundary_midpoint(real_values, lower_bounds, upper_bounds, parent_values):
+    """
+    Moves genes beyond a bound to the midpoint between that bound and the parent gene. Modifies `real_values` in-place.
+
+    :param real_values: The (N, D) matrix to be modified.
+    :param lower_bounds: Lower bound of every dimension.
+    :param upper_bounds: Upper bound of every dimension.
+    :param parent_values: The (N, D) matrix of parents, which are expected to lie within the bounds.
+    """
+    if parent_values is None:
+        raise ValueError("Midpoint boundary fixing requires the parent population.")
+
+    above, below = real_values > upper_bounds, real_values < lower_bounds
+    np.copyto(real_values, (parent_values + upper_bounds) / 2, where=above)
+    np.copyto(real_values, (parent_values + lower_bounds) / 2, where=below)
 
 
-def boundary_random(member: Member):
+def boundary_wrap(real_values, lower_bounds, upper_bounds):
     """
-    Modifies the values of `member` in-place.
+    Wraps genes beyond a bound around to the opposite side of the interval, genes of a zero-width interval
+    are set to its bound. Modifies `real_values` in-place.
 
-    :param member: The member to be modified.
+    :param real_values: The (N, D) matrix to be modified.
+    :param lower_bounds: Lower bound of every dimension.
+    :param upper_bounds: Upper bound of every dimension.
     """
-    for chromosome in member.chromosomes:
-        if chromosome.real_value < chromosome.interval[0] or chromosome.real_value > chromosome.interval[1]:
-            chromosome.real_value = Chromosome(member.interval).real_value
+    outside = (real_values < lower_bounds) | (real_values > upper_bounds)
+    widths = upper_bounds - lower_bounds
+    with np.errstate(divide='ignore', invalid='ignore'):
+        wrapped = lower_bounds + np.mod(real_values - lower_bounds, widths)
+    wrapped = np.where(widths > 0, wrapped, lower_bounds)
+    np.copyto(real_values, wrapped, where=outside)
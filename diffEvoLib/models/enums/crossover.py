@@ -0,0 +1,6 @@
+from enum import Enum
+
+
+class CrossoverType(Enum):
+    BINOMIAL = 'binomial'
+    EXPONENTIAL = 'exponential'
@@ -0,0 +1,6 @@
+from enum import Enum
+
+
+class KernelBackend(Enum):
+    NUMPY = 'numpy'
+    NUMBA = 'numba'   # JIT compiled kernels, NumPy is used when numba is not installed
@@ -0,0 +1,23 @@
+import numpy as np
+from enum import Enum
+
+
+class MigrationTopology(Enum):
+    RING = 'ring'
+    RANDOM = 'random'
+
+
+def get_migration_destinations(topology: MigrationTopology, nr_of_islands, rng: np.random.Generator = None):
+    """
+    :param topology: The way islands are connected.
+    :param nr_of_islands: Number of islands.
+    :param rng: Random generator used by RANDOM, a new one is created when not given.
+    :return: Index of the island every island sends its migrants to.
+    """
+    if topology == MigrationTopology.RING:
+        return (np.arange(nr_of_islands) + 1) % nr_of_islands
+
+    rng = np.random.default_rng() if rng is None else rng
+    # Any other island, drawn from the remaining ones and shifted over the sender
+    destinations = rng.integers(0, nr_of_islands - 1, size=nr_of_islands)
+    return destinations + (destinations >= np.arange(nr_of_islands))
@@ -1,6 +1,14 @@
+import numpy as np
 from enum import Enum
 
 
 class OptimizationType(Enum):
     MAXIMIZATION = 'maximization'
     MINIMIZATION = 'minimization'
+
+
+def get_worst_fitness(optimization: OptimizationType):
+    """
+    :return: The worst possible fitness value, inf for minimization and -inf for maximization.
+    """
+    return np.inf if optimization == OptimizationType.MINIMIZATION else -np.inf
@@ -1,26 +1,104 @@
-from typing import Callable
+import asyncio
+import concurrent.futures
+import http.client
+import json
+import math
+import os
+import queue
+import select
+import shlex
+import subprocess
+import threading
+import urllib.parse
+import numpy as np
+from typing import Awaitable, Callable
 from abc import ABC, abstractmethod
 
 
+class RowEvaluationError(Exception):
+    """
+    Raised by `eval_batch` of functions isolating failing rows themselves. Holds the fitness values of the batch
+    (NaN for the failed rows), so evaluators count the failures without evaluating the batch again.
+    """
+
+    def __init__(self, fitness_values, nr_of_errors=0, nr_of_timeouts=0):
+        super().__init__(fitness_values, nr_of_errors, nr_of_timeouts)
+        self.fitness_values = fitness_values
+        self.nr_of_errors = nr_of_errors
+        self.nr_of_timeouts = nr_of_timeouts
+
+    def __str__(self):
+        return f"{self.nr_of_errors} rows failed and {self.nr_of_timeouts} rows timed out."
+
+
 class FitnessFunctionBase(ABC):
     def __init__(self):
         self.name = ""
         self.function = None
+        self.vectorized = False
+        self.is_async = False
 
     @abstractmethod
     def eval(self, params):
         pass
 
+    def eval_batch(self, real_values):
+        """
+        Evaluates every row of a (N, D) matrix. Subclasses able to evaluate the whole matrix at once override it
+        and set `vectorized`.
+
+        :param real_values: Matrix with one parameter vector per row.
+        :return: Fitness vector of length N.
+        """
+        return np.fromiter((self.eval(params) for params in real_values), dtype=float, count=len(real_values))
+
 
 class FitnessFunction(FitnessFunctionBase):
-    def __init__(self, func: Callable[..., float], custom_name=None):
+    def __init__(self, func: Callable[..., float], custom_name=None, vectorized=False):
+        """
+        :param func: Function taking one argument per dimension.
+        :param custom_name: Name used instead of the function name.
+        :param vectorized: Whether `func` also accepts one column vector per dimension and returns all
+                           fitness values at once.
+        """
         super().__init__()
         self.name = func.__name__ if custom_name is None else custom_name
         self.function = func
+        self.vectorized = vectorized
 
     def eval(self, params):
         return self.function(*params)
 
+    def eval_batch(self, real_values):
+        if not self.vectorized:
+            return super().eval_batch(real_values)
+
+        fitness_values = np.asarray(self.function(*real_values.T), dtype=float)
+        return np.broadcast_to(fitness_values, (len(real_values),)).copy()
+
+
+class CallableFitnessFunction(FitnessFunctionBase):
+    def __init__(self, func: Callable[[list], float]):
+        """
+        :param func: Function taking the list of parameters of a member, e.g. `FitnessFunctionBase.eval`.
+        """
+        super().__init__()
+        self.name = getattr(func, "__name__", type(func).__name__)
+        self.function = func
+
+    def eval(self, params):
+        return self.function(list(params))
+
+
+def as_fitness_function(fitness_fun):
+    """
+    :param fitness_fun: A fitness function or a plain callable taking the list of parameters of a member.
+    :return: The fitness function, a callable wrapped in `CallableFitnessFunction`.
+    """
+    if isinstance(fitness_fun, FitnessFunctionBase):
+        return fitness_fun
+    return CallableFitnessFunction(fitness_fun)
+
 
 class FitnessFunctionOpfunu(FitnessFunctionBase):
     def __init__(self, func_type, ndim, custom_name=None):
@@ -30,3 +108,381 @@ class FitnessFunctionOpfunu(FitnessFunctionBase):
 
     def eval(self, params):
         return self.function.evaluate(params)
+
+
+class AsyncFitnessFunction(FitnessFunctionBase):
+    def __init__(self, func: Callable[..., Awaitable[float]], custom_name=None, max_concurrency=64):
+        """
+        :param func: Coroutine function taking one argument per dimension, e.g. a query of a simulation server.
+        :param custom_name: Name used instead of the function name.
+        :param max_concurrency: Maximal number of evaluations awaited at the same time.
+        """
+        super().__init__()
+        self.name = func.__name__ if custom_name is None else custom_name
+        self.function = func
+        self.max_concurrency = max_concurrency
+        self.is_async = True
+
+    async def eval_async(self, params):
+        return await self.function(*params)
+
+    async def eval_batch_async(self, real_values, timeout=None, return_exceptions=False):
+        """
+        Evaluates the rows concurrently on the running event loop, at most `max_concurrency` at a time.
+
+        :param timeout: Time limit (seconds) of a single evaluation, TimeoutError is raised when it is exceeded.
+        :param return_exceptions: Whether exceptions of failed rows are returned in place of their values.
+        :return: List with the value (or exception) of every row.
+        """
+        semaphore = asyncio.Semaphore(self.max_concurrency)
+
+        async def eval_row(params):
+            async with semaphore:
+                return await asyncio.wait_for(self.eval_async(params), timeout)
+
+        return await asyncio.gather(*(eval_row(params) for params in real_values),
+                                    return_exceptions=return_exceptions)
+
+    # Blocking versions, which run their own event loop, so they can't be called from a running one
+
+    def eval(self, params):
+        return asyncio.run(self.eval_async(params))
+
+    def eval_batch(self, real_values):
+        return np.asarray(asyncio.run(self.eval_batch_async(real_values)), dtype=float)
+
+
+class PooledFitnessFunction(FitnessFunctionBase, ABC):
+    """
+    Base of fitness functions evaluating rows with a pool of reusable resources (e.g. connections or processes),
+    each of them evaluating one batch of rows at a time. Batches are evaluated concurrently, so the function is
+    marked vectorized and evaluators hand it whole matrices instead of single rows.
+
+    Resources are created on first use in every process, so the function can be pickled and sent
+    to worker processes, and are released by `close`.
+    """
+
+    def __init__(self, pool_size):
+        """
+        :param pool_size: Number of resources, i.e. batches evaluated at the same time.
+        """
+        super().__init__()
+        self.pool_size = pool_size
+        self.vectorized = True
+
+        self._resources = None
+        self._executor = None
+        self._lock = threading.Lock()
+        self._pid = None
+
+    @abstractmethod
+    def _create_resource(self):
+        pass
+
+    @abstractmethod
+    def _close_resource(self, resource):
+        pass
+
+    @abstractmethod
+    def _eval_with_resource(self, resource, real_values) -> np.ndarray:
+        """
+        Evaluates a batch of rows. A resource broken on the way is expected to be repaired (e.g. reconnected)
+        before returning or raising, as it goes back to the pool.
+        """
+        pass
+
+    def _get_batch_size(self, nr_of_rows):
+        return math.ceil(nr_of_rows / self.pool_size)
+
+    def eval(self, params):
+        return float(self._eval_batch_with_pool(np.asarray([params], dtype=float))[0])
+
+    def eval_batch(self, real_values):
+        if len(real_values) == 0:
+            return np.empty(0)
+
+        batch_size = max(self._get_batch_size(len(real_values)), 1)
+        batches = [real_values[start:start + batch_size] for start in range(0, len(real_values), batch_size)]
+        if len(batches) == 1:
+            return self._eval_batch_with_pool(batches[0])
+
+        self._open()
+        results = list(self._executor.map(self._eval_batch_isolating_rows, batches))
+
+        fitness_values = np.concatenate([result[0] for result in results])
+        nr_of_errors, nr_of_timeouts = sum(result[1] for result in results), sum(result[2] for result in results)
+        if nr_of_errors > 0 or nr_of_timeouts > 0:
+            raise RowEvaluationError(fitness_values, nr_of_errors, nr_of_timeouts)
+        return fitness_values
+
+    def _eval_batch_isolating_rows(self, real_values):
+        # Failed rows of a batch don't fail the other batches
+        try:
+            return self._eval_batch_with_pool(real_values), 0, 0
+        except RowEvaluationError as e:
+            return e.fitness_values, e.nr_of_errors, e.nr_of_timeouts
+
+    def close(self):
+        """
+        Releases the pooled resources, they are created again by the next evaluation.
+        """
+        with self._lock:
+            if self._executor is not None:
+                self._executor.shutdown(wait=True)
+            if self._resources is not None:
+                while not self._resources.empty():
+                    self._close_resource(self._resources.get_nowait())
+            self._resources, self._executor = None, None
+
+    def _open(self):
+        if self._pid != os.getpid():
+            # A forked process (e.g. a pool worker) inherits the pool but not its threads, so it opens its own
+            self._resources, self._executor, self._lock = None, None, threading.Lock()
+            self._pid = os.getpid()
+
+        with self._lock:
+            if self._resources is not None:
+                return
+
+            self._resources = queue.Queue()
+            for _ in range(self.pool_size):
+                self._resources.put(self._create_resource())
+            self._executor = concurrent.futures.ThreadPoolExecutor(max_workers=self.pool_size)
+
+    def _eval_batch_with_pool(self, real_values):
+        self._open()
+        resource = self._resources.get()
+        try:
+            return self._eval_with_resource(resource, real_values)
+        finally:
+            self._resources.put(resource)
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        state["_resources"], state["_executor"], state["_lock"], state["_pid"] = None, None, None, None
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._lock = threading.Lock()
+
+
+class RemoteFitnessFunction(PooledFitnessFunction):
+    """
+    Evaluates members through an HTTP/JSON service. Every request is a POST of {"vectors": [[x_1, ..., x_D], ...]}
+    to `url`, which is answered with {"fitness": [f_1, ...]} in the same order.
+
+    Rows are sent in batches of at most `max_batch_size` vectors over a pool of keep-alive connections,
+    up to `max_connections` batches in flight at the same time.
+    """
+
+    def __init__(self, url, custom_name=None, max_batch_size=64, max_connections=4, request_timeout=60.0,
+                 headers=None):
+        """
+        :param url: Address of the service, e.g. http://localhost:8000/evaluate.
+        :param custom_name: Name used instead of the url.
+        :param max_batch_size: Maximal number of vectors sent in a single request.
+        :param max_connections: Number of pooled connections, i.e. requests sent at the same time.
+        :param request_timeout: Socket timeout (seconds) of a request.
+        :param headers: Additional headers of every request (e.g. authorization).
+        """
+        super().__init__(max_connections)
+        self.name = url if custom_name is None else custom_name
+        self.function = url
+        self.url = url
+        self.max_batch_size = max_batch_size
+        self.max_connections = max_connections
+        self.request_timeout = request_timeout
+        self.headers = {"Content-Type": "application/json", **(headers or {})}
+
+        url_parts = urllib.parse.urlsplit(url)
+        self._scheme = url_parts.scheme
+        self._host, self._port = url_parts.hostname, url_parts.port
+        self._path = url_parts.path or "/"
+        if url_parts.query:
+            self._path += "?" + url_parts.query
+
+    def _get_batch_size(self, nr_of_rows):
+        return self.max_batch_size
+
+    def _create_resource(self):
+        connection_type = http.client.HTTPSConnection if self._scheme == "https" else http.client.HTTPConnection
+        # Connections connect on their first request and reconnect after being closed
+        return connection_type(self._host, self._port, timeout=self.request_timeout)
+
+    def _close_resource(self, connection: http.client.HTTPConnection):
+        connection.close()
+
+    def _eval_with_resource(self, connection: http.client.HTTPConnection, real_values):
+        body = json.dumps({"vectors": np.asarray(real_values, dtype=float).tolist()})
+        try:
+            response_body = self._request(connection, body)
+        except BaseException:
+            # The connection may be left in the middle of a response
+            connection.close()
+            raise
+
+        fitness_values = np.asarray(json.loads(response_body)["fitness"], dtype=float)
+        if fitness_values.shape != (len(real_values),):
+            raise ValueError(f"{self.name}: expected {len(real_values)} fitness values, got {fitness_values.shape}.")
+        return fitness_values
+
+    def _request(self, connection: http.client.HTTPConnection, body):
+        try:
+            connection.request("POST", self._path, body, self.headers)
+            response = connection.getresponse()
+        except (http.client.RemoteDisconnected, ConnectionResetError, BrokenPipeError):
+            # The server closed the idle keep-alive connection, retried once on a new one
+            connection.close()
+            connection.request("POST", self._path, body, self.headers)
+            response = connection.getresponse()
+
+        response_body = response.read()
+        if response.status != 200:
+            raise RuntimeError(f"{self.name}: request failed with {response.status} {response.reason}.")
+        return response_body
+
+
+class SimulatorProcess:
+    """
+    Long-lived simulator process of `SubprocessFitnessFunction`, started again when it crashes.
+    """
+
+    def __init__(self, command, cwd=None, env=None):
+        self.command = command
+        self.cwd = cwd
+        self.env = env
+        self.nr_of_restarts = 0
+        self._process = None
+        self.start()
+
+    def start(self):
+        self._process = subprocess.Popen(
+            self.command,
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            cwd=self.cwd,
+            env=self.env,
+            text=True,
+            bufsize=1
+        )
+
+    def restart(self):
+        # A crashed or stuck process is not waited for
+        self.stop(kill=True)
+        self.start()
+        self.nr_of_restarts += 1
+
+    def stop(self, kill=False):
+        if self._process is None:
+            return
+
+        if kill:
+            self._process.kill()
+        # The simulator is expected to exit at the end of its input
+        try:
+            self._process.stdin.close()
+        except OSError:
+            pass
+        try:
+            self._process.wait(timeout=1.0)
+        except subprocess.TimeoutExpired:
+            self._process.kill()
+            self._process.wait()
+        self._process.stdout.close()
+        self._process = None
+
+    def evaluate(self, params, timeout=None):
+        """
+        Writes a line with the parameters and reads a line with the fitness value.
+
+        :param timeout: Time limit (seconds) of the answer. It relies on `select.select` on the output pipe,
+                        so it is only enforced on POSIX systems.
+        :raise ChildProcessError: The process crashed.
+        :raise TimeoutError: The process didn't answer within `timeout` seconds.
+        :raise ValueError: The answer is not a number.
+        """
+        try:
+            self._process.stdin.write(" ".join(repr(param) for param in params) + "\n")
+            self._process.stdin.flush()
+        except (BrokenPipeError, OSError) as e:
+            raise ChildProcessError(f"Simulator process is not running ({e}).")
+
+        # Pipes can't be selected on Windows
+        if timeout is not None and os.name == "posix":
+            ready, _, _ = select.select([self._process.stdout], [], [], timeout)
+            if not ready:
+                raise TimeoutError(f"Simulator process didn't answer within {timeout} seconds.")
+
+        line = self._process.stdout.readline()
+        if not line:
+            raise ChildProcessError(f"Simulator process exited with code {self._process.wait()}.")
+        return float(line)
+
+
+class SubprocessFitnessFunction(PooledFitnessFunction):
+    """
+    Evaluates members with an external simulator executable, which is kept running between evaluations.
+    For every evaluation a line with the space separated parameters is written to the standard input
+    of a simulator process, which answers with a line holding the fitness value on its standard output.
+
+    Rows are split between `nr_of_processes` processes evaluating at the same time. A process which crashes
+    or doesn't answer in time is started again and the row is retried once. Rows failing again or answered
+    with something else than a number get NaN and are reported with `RowEvaluationError`, so evaluators count
+    them in their failures and runs give them the penalty fitness.
+
+    The processes are read through pipes with `select.select`, which is POSIX only, so the timeout is not
+    enforced on Windows.
+    """
+
+    def __init__(self, command, custom_name=None, nr_of_processes=None, timeout=None, cwd=None, env=None):
+        """
+        :param command: Command starting the simulator, a list of arguments or a string split like a shell does.
+        :param custom_name: Name used instead of the executable name.
+        :param nr_of_processes: Number of simulator processes, the number of CPUs by default.
+        :param timeout: Time limit (seconds) of a single evaluation, only enforced on POSIX systems.
+        :param cwd: Working directory of the simulator processes.
+        :param env: Environment of the simulator processes.
+        """
+        super().__init__(nr_of_processes if nr_of_processes is not None else (os.cpu_count() or 1))
+        self.command = shlex.split(command) if isinstance(command, str) else list(command)
+        self.name = os.path.basename(self.command[0]) if custom_name is None else custom_name
+        self.function = self.command
+        self.nr_of_processes = self.pool_size
+        self.timeout = timeout
+        self.cwd = cwd
+        self.env = env
+
+    def _create_resource(self):
+        return SimulatorProcess(self.command, self.cwd, self.env)
+
+    def _close_resource(self, process: SimulatorProcess):
+        process.stop()
+
+    def _eval_with_resource(self, process: SimulatorProcess, real_values):
+        fitness_values = np.full(len(real_values), np.nan)
+        nr_of_errors, nr_of_timeouts = 0, 0
+        try:
+            for i, params in enumerate(np.asarray(real_values, dtype=float).tolist()):
+                for attempt in range(2):
+                    try:
+                        fitness_values[i] = process.evaluate(params, self.timeout)
+                        break
+                    except (ChildProcessError, TimeoutError) as e:
+                        process.restart()
+                        if attempt == 1:
+                            nr_of_timeouts += isinstance(e, TimeoutError)
+                            nr_of_errors += isinstance(e, ChildProcessError)
+                    except ValueError:
+                        # The simulator answered with something else than a number
+                        nr_of_errors += 1
+                        break
+        except BaseException:
+            # Interrupted in the middle of a request (e.g. by an evaluator timeout), a late answer
+            # would be read by the next one
+            process.restart()
+            raise
+
+        if nr_of_errors > 0 or nr_of_timeouts > 0:
+            raise RowEvaluationError(fitness_values, nr_of_errors, nr_of_timeouts)
+        return fitness_values
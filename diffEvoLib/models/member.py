@@ -1,38 +1,95 @@
+import copy
 import numpy as np
 from diffEvoLib.models.chromosome import Chromosome
 
 
 class Member:
-    def __init__(self, interval, args_num):
-        self.chromosomes = np.array([Chromosome(interval) for _ in range(args_num)])
-        self.fitness_value = None
+    __slots__ = ('interval', 'args_num', '_real_values', '_fitness_values', '_chromosomes')
+
+    def __init__(self, interval, args_num, real_values=None, fitness_values=None, random_init=True):
+        """
+        :param interval: Lower and upper bound of the chromosomes.
+        :param args_num: Number of chromosomes.
+        :param real_values: Optional 1-D array the member is a view of (e.g. a population matrix row).
+                            When not given the member owns its values.
+        :param fitness_values: Optional one element array holding the member fitness value
+                               (e.g. a slice of the population fitness vector).
+        :param random_init: Whether owned values are drawn from the interval. When False they are set to
+                            zero and no random numbers are drawn, which is meant for temporary members.
+        """
         self.interval = interval
         self.args_num = args_num
 
+        if real_values is None:
+            if random_init:
+                real_values = np.random.uniform(interval[0], interval[1], size=args_num)
+            else:
+                real_values = np.zeros(args_num)
+        self.real_values = real_values
+        self._fitness_values = np.full(1, np.nan) if fitness_values is None else fitness_values
+
+    @property
+    def real_values(self):
+        return self._real_values
+
+    @real_values.setter
+    def real_values(self, real_values):
+        self._real_values = real_values
+        self._chromosomes = None
+
+    @property
+    def chromosomes(self):
+        # Chromosome views are created once and share the member storage
+        if self._chromosomes is None:
+            lower_bounds = np.broadcast_to(np.asarray(self.interval[0], dtype=float), self.args_num)
+            upper_bounds = np.broadcast_to(np.asarray(self.interval[1], dtype=float), self.args_num)
+
+            chromosomes = np.empty(self.args_num, dtype=object)
+            for i in range(self.args_num):
+                chromosomes[i] = Chromosome([lower_bounds[i], upper_bounds[i]], self._real_values, i)
+            self._chromosomes = chromosomes
+        return self._chromosomes
+
+    @chromosomes.setter
+    def chromosomes(self, chromosomes):
+        self._real_values[:] = [chromosome.real_value for chromosome in chromosomes]
+
+    @property
+    def fitness_value(self):
+        fitness_value = self._fitness_values[0]
+        return None if np.isnan(fitness_value) else float(fitness_value)
+
+    @fitness_value.setter
+    def fitness_value(self, fitness_value):
+        self._fitness_values[0] = np.nan if fitness_value is None else fitness_value
+
     def calculate_fitness_fun(self, fitness_fun):
-        self.fitness_value = fitness_fun([chromosome.real_value for chromosome in self.chromosomes])
+        self.fitness_value = fitness_fun(self.get_chromosomes())
 
     def get_chromosomes(self):
-        return [chromosome.real_value for chromosome in self.chromosomes]
+        return self._real_values.tolist()
 
     def is_member_in_interval(self):
-        for chromosome in self.chromosomes:
-            if not (self.interval[0] <= chromosome.real_value <= self.interval[1]):
-                return False
-        return True
+        return bool(np.all((self.interval[0] <= self._real_values) & (self._real_values <= self.interval[1])))
 
     def __str__(self):
         return f"Member: [\n" \
                f"\t Real values [" \
-               f"{''.join(str(chromosome.real_value) + '; ' for chromosome in self.chromosomes)}] \n" \
+               f"{''.join(str(real_value) + '; ' for real_value in self.get_chromosomes())}] \n" \
                f"\t Fitness value: {self.fitness_value}\n" \
                f"]"
 
+    def __deepcopy__(self, memo):
+        # Copies only the underlying arrays, so a copied view becomes a standalone member
+        return Member(
+            copy.deepcopy(self.interval, memo),
+            self.args_num,
+            real_values=self._real_values.copy(),
+            fitness_values=self._fitness_values.copy()
+        )
+
     def __add__(self, other):
-        chromosomes = self.chromosomes + other.chromosomes
-        new_member = Member(self.interval, self.args_num)
-        new_member.chromosomes = chromosomes
-        return new_member
+        return Member(self.interval, self.args_num, real_values=self._real_values + other.real_values)
 
     def __lt__(self, other):
         return self.fitness_value < other.fitness_value
@@ -53,8 +110,4 @@ class Member:
         return self.fitness_value >= other.fitness_value
 
     def __abs__(self):
-        # Implementation of the __abs__() method
-        abs_chromosomes = abs(self.chromosomes)
-        new_member = Member(self.interval, self.args_num)
-        new_member.chromosomes = abs_chromosomes
-        return new_member
+        return Member(self.interval, self.args_num, real_values=np.abs(self._real_values))
@@ -1,51 +1,216 @@
-import concurrent.futures
 import numpy as np
 
-from diffEvoLib.models.enums.optimization import OptimizationType
+from diffEvoLib.evaluators.base import BaseEvaluator
+from diffEvoLib.evaluators.thread_pool import ThreadPoolEvaluator
+from diffEvoLib.helpers.memmap_helper import create_matrix
+from diffEvoLib.models.enums.optimization import OptimizationType, get_worst_fitness
+from diffEvoLib.models.fitness_function import FitnessFunctionBase, as_fitness_function
 from diffEvoLib.models.member import Member
 
 
 class Population:
-    def __init__(self, interval, arg_num, size, optimization: OptimizationType):
+    def __init__(self, interval, arg_num, size, optimization: OptimizationType, storage_dir=None, chunk_size=None):
+        """
+        :param storage_dir: Directory of the `numpy.memmap` file backing the population matrix, for populations
+                            which don't fit in memory. The matrix is in memory when not given.
+        :param chunk_size: Number of rows generated, copied and evaluated at once, all rows by default.
+        """
         self.size = size
-        self.members = None
         self.optimization = optimization
 
         # chromosome config
         self.interval = interval
         self.arg_num = arg_num
 
-    def generate_population(self):
-        self.members = np.array([Member(self.interval, self.arg_num) for _ in range(self.size)])
+        self.storage_dir = storage_dir
+        self.chunk_size = chunk_size
 
-    @staticmethod
-    def calculate_fitness(member, fitness_fun):
-        args = member.get_chromosomes()
-        return member, fitness_fun(args)
+        # Population matrix (one row per member) and fitness vector (NaN until evaluated)
+        self.real_values = create_matrix((size, arg_num), storage_dir)
+        self.fitness_values = np.full(size, np.nan)
 
-    def update_fitness_values(self, fitness_fun):
-        with concurrent.futures.ThreadPoolExecutor() as executor:
-            futures = [executor.submit(self.calculate_fitness, member, fitness_fun) for member in self.members]
+        # Cached member views
+        self._members = None
+        self._members_source = (None, None)
 
-            for future in concurrent.futures.as_completed(futures):
-                member, fitness_value = future.result()
-                member.fitness_value = fitness_value
+    @property
+    def lower_bounds(self):
+        # Interval bounds may be scalars or have one value per dimension
+        return np.broadcast_to(np.asarray(self.interval[0], dtype=float), (self.arg_num,))
 
-        # for member in self.members:
-        #     member.calculate_fitness_fun(fitness_fun)
+    @property
+    def upper_bounds(self):
+        return np.broadcast_to(np.asarray(self.interval[1], dtype=float), (self.arg_num,))
+
+    def row_chunks(self):
+        """
+        :return: Slices of the consecutive rows processed at once, `chunk_size` rows each.
+        """
+        chunk_size = self.size if self.chunk_size is None else self.chunk_size
+        chunk_size = max(chunk_size, 1)
+        return [slice(start, min(start + chunk_size, self.size)) for start in range(0, self.size, chunk_size)]
+
+    def generate_population(self, rng: np.random.Generator = None):
+        uniform = np.random.uniform if rng is None else rng.uniform
+        # Rows are drawn in the order of a single draw of the whole matrix
+        for rows in self.row_chunks():
+            nr_of_rows = rows.stop - rows.start
+            self.real_values[rows] = uniform(self.interval[0], self.interval[1], size=(nr_of_rows, self.arg_num))
+        self.fitness_values = np.full(self.size, np.nan)
+
+    @property
+    def members(self):
+        """
+        Member views of the population matrix rows. Changes made through a member (its chromosomes or fitness
+        value) are made directly in the population matrix and fitness vector.
+        """
+        real_values_source, fitness_values_source = self._members_source
+        if self._members is None or real_values_source is not self.real_values \
+                or fitness_values_source is not self.fitness_values:
+            members = np.empty(self.size, dtype=object)
+            for i in range(self.size):
+                members[i] = Member(
+                    self.interval,
+                    self.arg_num,
+                    real_values=self.real_values[i],
+                    fitness_values=self.fitness_values[i:i + 1]
+                )
+            self._members = members
+            self._members_source = (self.real_values, self.fitness_values)
+        return self._members
+
+    @members.setter
+    def members(self, members):
+        # Written into a new matrix in the storage of the population, the members may be views of the current one
+        members = list(members)
+        self.size = len(members)
+        real_values = create_matrix((self.size, self.arg_num), self.storage_dir)
+        for rows in self.row_chunks():
+            real_values[rows] = [member.get_chromosomes() for member in members[rows]]
+
+        self.real_values = real_values
+        self.fitness_values = np.array(
+            [np.nan if member.fitness_value is None else member.fitness_value for member in members], dtype=float
+        )
+
+    def get_member(self, index):
+        """
+        Returns a standalone copy of the member, which is not affected by later population changes.
+        """
+        return Member(
+            self.interval,
+            self.arg_num,
+            real_values=self.real_values[index].copy(),
+            fitness_values=self.fitness_values[index:index + 1].copy()
+        )
+
+    def update_fitness_values(self, fitness_fun: FitnessFunctionBase, evaluator: BaseEvaluator = None,
+                              penalty_fitness=None):
+        """
+        :param fitness_fun: Function evaluating the members, a plain callable taking the list of parameters
+                            of a member is wrapped in `CallableFitnessFunction`.
+        :param evaluator: Execution backend of the evaluation. When not given, a thread pool is created
+                          for this call only.
+        :param penalty_fitness: Fitness value of members whose evaluation failed or timed out. By default the
+                                worst possible value of the optimization type (inf for minimization,
+                                -inf for maximization).
+        """
+        fitness_fun = as_fitness_function(fitness_fun)
+        if evaluator is None:
+            with ThreadPoolEvaluator() as evaluator:
+                self.set_fitness_values(self._evaluate(fitness_fun, evaluator), penalty_fitness)
+        else:
+            self.set_fitness_values(self._evaluate(fitness_fun, evaluator), penalty_fitness)
+
+    def _evaluate(self, fitness_fun: FitnessFunctionBase, evaluator: BaseEvaluator):
+        # Evaluated chunk by chunk, so only a chunk of a memmap population is read into memory at once
+        fitness_values = np.empty(self.size)
+        for rows in self.row_chunks():
+            fitness_values[rows] = evaluator.evaluate(fitness_fun, self.real_values[rows])
+        return fitness_values
+
+    async def _evaluate_async(self, fitness_fun: FitnessFunctionBase, evaluator: BaseEvaluator):
+        fitness_values = np.empty(self.size)
+        for rows in self.row_chunks():
+            fitness_values[rows] = await evaluator.evaluate_async(fitness_fun, self.real_values[rows])
+        return fitness_values
+
+    async def update_fitness_values_async(self, fitness_fun: FitnessFunctionBase, evaluator: BaseEvaluator = None,
+                                          penalty_fitness=None):
+        """
+        Coroutine version of `update_fitness_values`, see `BaseEvaluator.evaluate_async`.
+        """
+        fitness_fun = as_fitness_function(fitness_fun)
+        if evaluator is None:
+            with ThreadPoolEvaluator() as evaluator:
+                self.set_fitness_values(await self._evaluate_async(fitness_fun, evaluator), penalty_fitness)
+        else:
+            self.set_fitness_values(await self._evaluate_async(fitness_fun, evaluator), penalty_fitness)
+
+    def set_fitness_values(self, fitness_values, penalty_fitness=None):
+        """
+        Writes evaluated fitness values in place, NaN values of failed evaluations are replaced
+        by the penalty fitness (see `update_fitness_values`).
+        """
+        self.fitness_values[:] = fitness_values
+
+        if penalty_fitness is None:
+            penalty_fitness = get_worst_fitness(self.optimization)
+        self.fitness_values[np.isnan(self.fitness_values)] = penalty_fitness
+
+    def get_best_indices(self, nr_of_members):
+        """
+        :return: Indices of the `nr_of_members` best members according to the optimization type, the best first.
+        """
+        return np.argsort(self._get_fitness_sign() * self.fitness_values)[:nr_of_members]
 
     def get_best_members(self, nr_of_members):
-        # Get the indices that would sort the array based on the key function
-        sorted_indices = np.argsort([member.fitness_value for member in self.members])
-        # Use the sorted indices to sort the array
-        sorted_array = self.members[sorted_indices]
-        return sorted_array[:nr_of_members]
+        return self.members[self.get_best_indices(nr_of_members)]
+
+    def get_ranked_indices(self):
+        """
+        :return: Indices of all members from the best to the worst one according to the optimization type.
+        """
+        return np.argsort(self._get_fitness_sign() * self.fitness_values, kind='stable')
+
+    def _get_fitness_sign(self):
+        # Fitness values multiplied by the sign are ordered from the best to the worst
+        return 1.0 if self.optimization == OptimizationType.MINIMIZATION else -1.0
+
+    def copy(self):
+        new_population = Population(
+            interval=self.interval,
+            arg_num=self.arg_num,
+            size=self.size,
+            optimization=self.optimization,
+            storage_dir=self.storage_dir,
+            chunk_size=self.chunk_size
+        )
+        # Copied into the new storage chunk by chunk
+        for rows in self.row_chunks():
+            new_population.real_values[rows] = self.real_values[rows]
+        new_population.fitness_values = self.fitness_values.copy()
+        return new_population
+
+    def get_subpopulation(self, indices):
+        """
+        Returns a standalone population of copies of the members at `indices`.
+        """
+        new_population = Population(
+            interval=self.interval,
+            arg_num=self.arg_num,
+            size=len(indices),
+            optimization=self.optimization
+        )
+        new_population.real_values = self.real_values[indices]
+        new_population.fitness_values = self.fitness_values[indices]
+        return new_population
 
     def mean(self):
-        return np.mean([member.fitness_value for member in self.members])
+        return np.mean(self.fitness_values)
 
     def std(self):
-        return np.std([member.fitness_value for member in self.members])
+        return np.std(self.fitness_values)
 
     def __str__(self, population_label=""):
         output = f"Population{population_label}:"
@@ -0,0 +1,12 @@
+import numpy as np
+
+from diffEvoLib.models.enums.boundary_constrain import boundary_wrap
+
+
+def test_wrap_sets_genes_of_zero_width_intervals_to_the_bound():
+    real_values = np.array([[3.0, -7.0, 0.5], [1.0, 9.0, 2.0]])
+    lower_bounds, upper_bounds = np.array([1.0, -5.0, 0.0]), np.array([1.0, 5.0, 1.0])
+
+    boundary_wrap(real_values, lower_bounds, upper_bounds)
+
+    np.testing.assert_allclose(real_values, [[1.0, 3.0, 0.5], [1.0, -1.0, 0.0]])
@@ -0,0 +1,179 @@
+import asyncio
+import os
+import time
+from multiprocessing import shared_memory
+
+import numpy as np
+import pytest
+
+from diffEvoLib.evaluators.auto import AutoEvaluator
+from diffEvoLib.evaluators.process_pool import ProcessPoolEvaluator
+from diffEvoLib.evaluators.serial import SerialEvaluator
+from diffEvoLib.evaluators.thread_pool import ThreadPoolEvaluator
+from diffEvoLib.models.enums.optimization import OptimizationType
+from diffEvoLib.models.fitness_function import AsyncFitnessFunction, FitnessFunction
+from diffEvoLib.models.population import Population
+
+# Process running the tests, fitness functions only crash in worker processes
+_MAIN_PID = os.getpid()
+
+
+def _crash_on_negative(*params):
+    if params[0] < 0:
+        if os.getpid() != _MAIN_PID:
+            os._exit(1)
+        raise RuntimeError("Crashed the worker.")
+    return float(sum(params))
+
+
+def _population(real_values):
+    population = Population(interval=[-5.0, 5.0], arg_num=real_values.shape[1], size=len(real_values),
+                            optimization=OptimizationType.MINIMIZATION)
+    population.real_values[:] = real_values
+    return population
+
+
+def test_process_pool_recovers_from_crashed_workers():
+    real_values = np.array([[1.0, 2.0], [-1.0, 2.0], [3.0, 1.0], [2.0, 2.0], [-4.0, 0.0], [1.0, 1.0]])
+    population = _population(real_values)
+
+    with ProcessPoolEvaluator(max_workers=2, chunk_size=2) as evaluator:
+        population.update_fitness_values(FitnessFunction(_crash_on_negative), evaluator)
+        failure_counts = evaluator.failure_counts()
+
+    # Only the rows crashing their worker are lost, they get the penalty fitness
+    np.testing.assert_allclose(population.fitness_values, [3.0, np.inf, 4.0, 4.0, np.inf, 2.0])
+    assert failure_counts == {"errors": 0, "timeouts": 0, "worker_crashes": 2}
+
+
+def _fail_on_negative(*params):
+    if params[0] < 0:
+        raise ValueError("Negative parameter.")
+    return float(sum(params))
+
+
+def _nan_on_negative(*params):
+    return float("nan") if params[0] < 0 else float(sum(params))
+
+
+def _sleep_on_negative(*params):
+    if params[0] < 0:
+        time.sleep(1.0)
+    return float(sum(params))
+
+
+_REAL_VALUES = np.array([[1.0, 2.0], [-1.0, 2.0], [3.0, 1.0], [-2.0, 0.0]])
+
+
+@pytest.mark.parametrize("evaluator_type", [SerialEvaluator, ThreadPoolEvaluator])
+def test_raising_rows_get_the_penalty_fitness(evaluator_type):
+    population = _population(_REAL_VALUES)
+
+    with evaluator_type() as evaluator:
+        population.update_fitness_values(FitnessFunction(_fail_on_negative), evaluator, penalty_fitness=100.0)
+        failure_counts = evaluator.failure_counts()
+
+    np.testing.assert_allclose(population.fitness_values, [3.0, 100.0, 4.0, 100.0])
+    assert failure_counts == {"errors": 2, "timeouts": 0, "worker_crashes": 0}
+
+
+def test_nan_fitness_values_get_the_penalty_fitness():
+    population = _population(_REAL_VALUES)
+
+    with SerialEvaluator() as evaluator:
+        population.update_fitness_values(FitnessFunction(_nan_on_negative), evaluator)
+        failure_counts = evaluator.failure_counts()
+
+    # Returned NaN values are not failed evaluations, but they get the penalty fitness as well
+    np.testing.assert_allclose(population.fitness_values, [3.0, np.inf, 4.0, np.inf])
+    assert failure_counts == {"errors": 0, "timeouts": 0, "worker_crashes": 0}
+
+
+def test_serial_evaluator_timeout():
+    population = _population(_REAL_VALUES)
+
+    with SerialEvaluator(timeout=0.1) as evaluator:
+        start_time = time.perf_counter()
+        population.update_fitness_values(FitnessFunction(_sleep_on_negative), evaluator)
+        elapsed_time = time.perf_counter() - start_time
+        failure_counts = evaluator.failure_counts()
+
+    np.testing.assert_allclose(population.fitness_values, [3.0, np.inf, 4.0, np.inf])
+    assert failure_counts == {"errors": 0, "timeouts": 2, "worker_crashes": 0}
+    assert elapsed_time < 1.0
+
+
+class _FailingSubmitEvaluator(ThreadPoolEvaluator):
+    """
+    Thread pool whose first submitted task can't be scheduled, like one of a pool which was shut down.
+    """
+
+    def __init__(self):
+        super().__init__(max_workers=1)
+        self.nr_of_failed_submits = 1
+
+    def submit_chunk(self, fitness_fun, real_values):
+        if self.nr_of_failed_submits > 0:
+            self.nr_of_failed_submits -= 1
+            raise RuntimeError("cannot schedule new futures after shutdown")
+        return super().submit_chunk(fitness_fun, real_values)
+
+
+def test_failed_submit_does_not_break_utilization():
+    fitness_fun = FitnessFunction(_fail_on_negative)
+
+    with _FailingSubmitEvaluator() as evaluator:
+        with pytest.raises(RuntimeError):
+            evaluator.submit(fitness_fun, _REAL_VALUES)
+        fitness_values = evaluator.submit(fitness_fun, _REAL_VALUES[:1]).result()
+        utilization = evaluator.utilization()
+
+    np.testing.assert_allclose(fitness_values, [3.0])
+    # The wall time is only recorded once no task is running
+    assert len(utilization) == 1
+
+
+@pytest.mark.parametrize("adaptive_chunking", [False, True])
+def test_shared_memory_matches_pickled_evaluation(adaptive_chunking):
+    real_values = np.random.default_rng(0).uniform(0, 5, size=(50, 4))
+    fitness_fun = FitnessFunction(_fail_on_negative)
+
+    with ProcessPoolEvaluator(max_workers=2, adaptive_chunking=adaptive_chunking) as evaluator:
+        pickled_values = evaluator.evaluate(fitness_fun, real_values)
+
+    evaluator = ProcessPoolEvaluator(max_workers=2, adaptive_chunking=adaptive_chunking, shared_memory=True)
+    with evaluator:
+        shared_values = evaluator.evaluate(fitness_fun, real_values)
+        # Smaller matrices reuse the blocks
+        smaller_values = evaluator.evaluate(fitness_fun, real_values[:20])
+        block_names = [evaluator._shared_input.name, evaluator._shared_output.name]
+
+    assert np.array_equal(shared_values, pickled_values)
+    assert np.array_equal(smaller_values, pickled_values[:20])
+
+    # The blocks are removed by the shutdown
+    for name in block_names:
+        with pytest.raises(FileNotFoundError):
+            shared_memory.SharedMemory(name=name)
+
+
+async def _async_fail_on_negative(*params):
+    await asyncio.sleep(0)
+    return _fail_on_negative(*params)
+
+
+@pytest.mark.parametrize("fitness_fun, backend", [
+    (AsyncFitnessFunction(_async_fail_on_negative), "async"),
+    (FitnessFunction(_fail_on_negative), "serial"),
+])
+def test_auto_evaluator_async_evaluation(fitness_fun, backend):
+    population = _population(_REAL_VALUES)
+
+    with AutoEvaluator(max_workers=2, timeout=0.2) as evaluator:
+        asyncio.run(population.update_fitness_values_async(fitness_fun, evaluator))
+        description = evaluator.describe()
+
+    np.testing.assert_allclose(population.fitness_values, [3.0, np.inf, 4.0, np.inf])
+    assert description["backend"] == backend
+    assert description["failures"]["errors"] == 2
+    assert evaluator.failure_counts()["errors"] == 2
@@ -0,0 +1,143 @@
+import numpy as np
+import pytest
+
+pytest.importorskip("numba")
+
+from diffEvoLib import Default, BestWorst, RandomLocations, NovelModified, AdaptiveParams, EmDe, \
+    ScalingParams, DefaultAlgData, BestWorstData, RandomLocationsData, NovelModifiedData, AdaptiveParamsData, \
+    EmDeData, ScalingParamsData, OptimizationType, BoundaryFixing, CrossoverType, KernelBackend, FitnessFunction, \
+    SerialEvaluator
+from diffEvoLib.diffEvoAlgs.methods.methods_best_worst import best_worst_mutation
+from diffEvoLib.diffEvoAlgs.methods.methods_default import fused_trials, crossing, selection
+from diffEvoLib.diffEvoAlgs.methods.methods_emde import em_mutation
+from diffEvoLib.diffEvoAlgs.methods.methods_jit import get_kernel_fun
+from diffEvoLib.models.population import Population
+
+SEED = 12345
+
+
+def _population(size=30, arg_num=6, chunk_size=None, seed=0):
+    population = Population(interval=[-5.0, 5.0], arg_num=arg_num, size=size,
+                            optimization=OptimizationType.MINIMIZATION, chunk_size=chunk_size)
+    rng = np.random.default_rng(seed)
+    population.generate_population(rng=rng)
+    population.fitness_values[:] = rng.uniform(size=size)
+    return population
+
+
+def _run_both(operator, *args, **kwargs):
+    """
+    Runs the NumPy operator and its NUMBA variant on the same random generator state.
+    """
+    return [get_kernel_fun(operator, kernel_backend)(*args, rng=np.random.default_rng(SEED), **kwargs)
+            for kernel_backend in KernelBackend]
+
+
+@pytest.mark.parametrize("chunk_size", [None, 7])
+@pytest.mark.parametrize("crossover_type", list(CrossoverType))
+@pytest.mark.parametrize("fix_type", list(BoundaryFixing))
+def test_fused_trials(fix_type, crossover_type, chunk_size):
+    population = _population(chunk_size=chunk_size)
+    chunk_shape = (population.row_chunks()[0].stop, population.arg_num)
+
+    trials = []
+    for kernel_backend in KernelBackend:
+        trial_population = population.copy()
+        get_kernel_fun(fused_trials, kernel_backend)(
+            population, 0.9, 0.7, crossover_type, fix_type, trial_population, np.empty(chunk_shape),
+            np.empty(chunk_shape, dtype=bool), rng=np.random.default_rng(SEED)
+        )
+        trials.append(trial_population)
+
+    assert np.array_equal(trials[0].real_values, trials[1].real_values)
+
+
+def test_fused_trials_wrap_zero_width_interval():
+    population = Population(interval=[[-1.0, 2.0, 0.0], [1.0, 2.0, 1.0]], arg_num=3, size=10,
+                            optimization=OptimizationType.MINIMIZATION)
+    population.generate_population(rng=np.random.default_rng(0))
+
+    trials = []
+    for kernel_backend in KernelBackend:
+        trial_population = population.copy()
+        get_kernel_fun(fused_trials, kernel_backend)(
+            population, 2.0, 0.9, CrossoverType.BINOMIAL, BoundaryFixing.WRAP, trial_population,
+            np.empty((10, 3)), np.empty((10, 3), dtype=bool), rng=np.random.default_rng(SEED)
+        )
+        trials.append(trial_population.real_values)
+
+    assert np.array_equal(trials[0], trials[1])
+    assert np.all(trials[0][:, 1] == 2.0)
+
+
+@pytest.mark.parametrize("crossover_type", list(CrossoverType))
+def test_crossing(crossover_type):
+    population = _population()
+    mutated_population = _population(seed=1)
+
+    numpy_trials, numba_trials = _run_both(crossing, population, mutated_population, 0.6, crossover_type)
+    assert np.array_equal(numpy_trials.real_values, numba_trials.real_values)
+
+
+@pytest.mark.parametrize("indices", [None, [3, 0, 17, 29]])
+def test_selection(indices):
+    size = 30 if indices is None else len(indices)
+    trial_population = _population(size=size, seed=1)
+
+    results = []
+    for kernel_backend in KernelBackend:
+        population = _population()
+        improved = get_kernel_fun(selection, kernel_backend)(population, trial_population, indices)
+        results.append((population, improved))
+
+    (numpy_population, numpy_improved), (numba_population, numba_improved) = results
+    assert np.array_equal(numpy_improved, numba_improved)
+    assert np.array_equal(numpy_population.real_values, numba_population.real_values)
+    assert np.array_equal(numpy_population.fitness_values, numba_population.fitness_values)
+
+
+def test_em_mutation():
+    numpy_mutants, numba_mutants = _run_both(em_mutation, _population())
+    assert np.array_equal(numpy_mutants.real_values, numba_mutants.real_values)
+
+
+def test_best_worst_mutation():
+    numpy_mutants, numba_mutants = _run_both(best_worst_mutation, _population())
+    assert np.array_equal(numpy_mutants.real_values, numba_mutants.real_values)
+
+
+def _sphere(*params):
+    return float(np.sum(np.square(params)))
+
+
+_ALGORITHMS = [
+    (Default, DefaultAlgData, {"mutation_factor": 0.5, "crossover_rate": 0.8}),
+    (BestWorst, BestWorstData, {"mutation_factor": 0.5, "crossover_rate": 0.8}),
+    (RandomLocations, RandomLocationsData, {"mutation_factor": 0.5, "crossover_rate": 0.8}),
+    (NovelModified, NovelModifiedData, {"delta_f": 0.1, "delta_cr": 0.1, "sp": 3}),
+    (AdaptiveParams, AdaptiveParamsData, {"prob_f": 0.1, "prob_cr": 0.1}),
+    (EmDe, EmDeData, {"crossover_rate": 0.8}),
+    (ScalingParams, ScalingParamsData, {}),
+]
+
+
+@pytest.mark.parametrize("crossover_type", list(CrossoverType))
+@pytest.mark.parametrize("algorithm_type, data_type, algorithm_params", _ALGORITHMS,
+                         ids=[algorithm[0].__name__ for algorithm in _ALGORITHMS])
+def test_algorithm_run(algorithm_type, data_type, algorithm_params, crossover_type):
+    populations = []
+    for kernel_backend in KernelBackend:
+        params = data_type(
+            num_of_epochs=15, population_size=20, nr_of_args=5, interval_lower_bound=-5,
+            interval_higher_bound=5, mode=OptimizationType.MINIMIZATION,
+            boundary_constraints_fun=BoundaryFixing.REFLECTION, function=FitnessFunction(_sphere),
+            crossover_type=crossover_type, seed=SEED, kernel_backend=kernel_backend, **algorithm_params
+        )
+        with algorithm_type(params, evaluator=SerialEvaluator()) as algorithm:
+            algorithm.initialize()
+            algorithm.run()
+            populations.append(algorithm._pop)
+
+    numpy_population, numba_population = populations
+    assert np.array_equal(numpy_population.real_values, numba_population.real_values)
+    assert np.array_equal(numpy_population.fitness_values, numba_population.fitness_values)
@@ -0,0 +1,43 @@
+import numpy as np
+import pytest
+
+from diffEvoLib import Default, BestWorst, RandomLocations, NovelModified, EmDe, DefaultAlgData, BestWorstData, \
+    RandomLocationsData, NovelModifiedData, EmDeData, OptimizationType, BoundaryFixing, FitnessFunction, \
+    SerialEvaluator
+
+# Algorithms only comparing fitness values, AdaptiveParams and ScalingParams also use their magnitude
+# and treat both optimization types differently on purpose
+_ALGORITHMS = [
+    (Default, DefaultAlgData, dict(mutation_factor=0.5, crossover_rate=0.8)),
+    (BestWorst, BestWorstData, dict(mutation_factor=0.5, crossover_rate=0.8)),
+    (RandomLocations, RandomLocationsData, dict(mutation_factor=0.5, crossover_rate=0.8)),
+    (NovelModified, NovelModifiedData, dict(delta_f=0.1, delta_cr=0.1, sp=3)),
+    (EmDe, EmDeData, dict(crossover_rate=0.8)),
+]
+
+
+def _sphere(*params):
+    return float(np.sum(np.square(params)))
+
+
+def _negated_sphere(*params):
+    return -_sphere(*params)
+
+
+def _run(alg_type, data_type, alg_params, mode, function):
+    params = data_type(num_of_epochs=10, population_size=20, nr_of_args=4, interval_lower_bound=-5,
+                       interval_higher_bound=5, mode=mode, boundary_constraints_fun=BoundaryFixing.REFLECTION,
+                       function=FitnessFunction(function), seed=7, **alg_params)
+    with alg_type(params, evaluator=SerialEvaluator()) as alg:
+        alg.initialize()
+        alg.run()
+        return alg._pop.real_values.copy()
+
+
+@pytest.mark.parametrize("alg_type, data_type, alg_params", _ALGORITHMS)
+def test_maximization_mirrors_minimization(alg_type, data_type, alg_params):
+    # Maximizing the negated function has to take the same steps as minimizing the function
+    minimized = _run(alg_type, data_type, alg_params, OptimizationType.MINIMIZATION, _sphere)
+    maximized = _run(alg_type, data_type, alg_params, OptimizationType.MAXIMIZATION, _negated_sphere)
+
+    np.testing.assert_array_equal(maximized, minimized)
@@ -0,0 +1,52 @@
+import numpy as np
+
+from diffEvoLib.evaluators.serial import SerialEvaluator
+from diffEvoLib.models.enums.optimization import OptimizationType
+from diffEvoLib.models.population import Population
+
+
+def _population(size=5, arg_num=3, **kwargs):
+    population = Population(interval=[-1.0, 1.0], arg_num=arg_num, size=size,
+                            optimization=OptimizationType.MINIMIZATION, **kwargs)
+    population.generate_population(rng=np.random.default_rng(0))
+    return population
+
+
+def test_update_fitness_values_accepts_a_plain_callable():
+    population = _population()
+
+    population.update_fitness_values(lambda params: sum(params), SerialEvaluator())
+
+    np.testing.assert_allclose(population.fitness_values, population.real_values.sum(axis=1))
+
+
+def test_best_indices_follow_the_optimization_type():
+    population = _population()
+    population.fitness_values[:] = [3.0, 1.0, 4.0, 0.5, 2.0]
+
+    assert list(population.get_best_indices(2)) == [3, 1]
+
+    population.optimization = OptimizationType.MAXIMIZATION
+    assert list(population.get_best_indices(2)) == [2, 0]
+
+
+def test_members_setter_keeps_the_storage(tmp_path):
+    population = _population(storage_dir=str(tmp_path), chunk_size=2)
+    expected = population.real_values[::-1].copy()
+
+    # Reversed through the member views of the population itself
+    population.members = population.members[::-1]
+
+    assert isinstance(population.real_values, np.memmap)
+    np.testing.assert_array_equal(population.real_values, expected)
+    assert population.chunk_size == 2
+
+
+def test_members_setter_keeps_the_shape_of_an_empty_population():
+    population = _population()
+
+    population.members = []
+
+    assert population.real_values.shape == (0, 3)
+    assert population.fitness_values.shape == (0,)
+    assert population.size == 0
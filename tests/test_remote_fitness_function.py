@@ -0,0 +1,78 @@
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import numpy as np
+import pytest
+
+from diffEvoLib.models.fitness_function import RemoteFitnessFunction
+
+
+class _EvaluationHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def do_POST(self):
+        vectors = json.loads(self.rfile.read(int(self.headers["Content-Length"])))["vectors"]
+        self.server.batches.append(len(vectors))
+        self.server.connections.add(self.client_address)
+
+        body = json.dumps({"fitness": [float(np.sum(np.square(vector))) for vector in vectors]}).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+        # The connection is dropped without announcing it, like an idle keep-alive connection closed by a server
+        if self.server.drop_connections:
+            self.close_connection = True
+
+    def log_message(self, format, *args):
+        pass
+
+
+@pytest.fixture
+def server():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _EvaluationHandler)
+    server.batches, server.connections, server.drop_connections = [], set(), False
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+    thread.join()
+
+
+def _url(server):
+    return f"http://127.0.0.1:{server.server_address[1]}/evaluate"
+
+
+def test_batches_are_split_and_returned_in_order(server):
+    real_values = np.random.default_rng(0).uniform(-5, 5, size=(23, 3))
+    fitness_fun = RemoteFitnessFunction(_url(server), max_batch_size=5, max_connections=3)
+    try:
+        fitness_values = fitness_fun.eval_batch(real_values)
+    finally:
+        fitness_fun.close()
+
+    np.testing.assert_allclose(fitness_values, np.sum(np.square(real_values), axis=1))
+    assert sorted(server.batches) == [3, 5, 5, 5, 5]
+    assert fitness_fun.eval(real_values[0]) == pytest.approx(np.sum(np.square(real_values[0])))
+
+
+def test_dropped_keep_alive_connection_is_retried(server):
+    server.drop_connections = True
+    real_values = np.arange(12, dtype=float).reshape(4, 3)
+    fitness_fun = RemoteFitnessFunction(_url(server), max_batch_size=4, max_connections=1)
+    try:
+        first_values = fitness_fun.eval_batch(real_values)
+        # Sent over the pooled connection the server has closed
+        second_values = fitness_fun.eval_batch(real_values[::-1])
+    finally:
+        fitness_fun.close()
+
+    expected_values = np.sum(np.square(real_values), axis=1)
+    np.testing.assert_allclose(first_values, expected_values)
+    np.testing.assert_allclose(second_values, expected_values[::-1])
+    assert server.batches == [4, 4]
+    assert len(server.connections) == 2
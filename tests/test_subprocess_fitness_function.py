@@ -0,0 +1,83 @@
+import os
+import sys
+import textwrap
+
+import numpy as np
+import pytest
+
+from diffEvoLib.evaluators.serial import SerialEvaluator
+from diffEvoLib.models.enums.optimization import OptimizationType
+from diffEvoLib.models.fitness_function import RowEvaluationError, SubprocessFitnessFunction
+from diffEvoLib.models.population import Population
+
+# Stub simulator answering with the sum of the parameters. The first parameter selects a failure:
+# -1 crashes the first time only, -2 always crashes, -3 never answers and -4 answers with a malformed line.
+_SIMULATOR = textwrap.dedent("""
+    import os
+    import sys
+    import time
+
+    marker = sys.argv[1]
+    for line in sys.stdin:
+        params = [float(value) for value in line.split()]
+        if params[0] == -1.0 and not os.path.exists(marker):
+            open(marker, "w").close()
+            sys.exit(1)
+        if params[0] == -2.0:
+            sys.exit(1)
+        if params[0] == -3.0:
+            time.sleep(10.0)
+        if params[0] == -4.0:
+            print("not a number", flush=True)
+            continue
+        print(sum(params), flush=True)
+""")
+
+
+@pytest.fixture
+def simulator_command(tmp_path):
+    script = tmp_path / "simulator.py"
+    script.write_text(_SIMULATOR)
+    return [sys.executable, str(script), str(tmp_path / "crashed")]
+
+
+def _population(real_values):
+    population = Population(interval=[-5.0, 5.0], arg_num=real_values.shape[1], size=len(real_values),
+                            optimization=OptimizationType.MINIMIZATION)
+    population.real_values[:] = real_values
+    return population
+
+
+def test_crashed_simulator_is_restarted(simulator_command):
+    population = _population(np.array([[1.0, 2.0], [-1.0, 2.0], [3.0, 1.0]]))
+    fitness_fun = SubprocessFitnessFunction(simulator_command, nr_of_processes=1)
+
+    with SerialEvaluator() as evaluator:
+        population.update_fitness_values(fitness_fun, evaluator)
+        failure_counts = evaluator.failure_counts()
+    fitness_fun.close()
+
+    # The row crashing the simulator once is retried by the restarted one
+    assert os.path.exists(simulator_command[-1])
+    np.testing.assert_allclose(population.fitness_values, [3.0, 1.0, 4.0])
+    assert failure_counts == {"errors": 0, "timeouts": 0, "worker_crashes": 0}
+
+
+@pytest.mark.skipif(os.name != "posix", reason="The timeout is only enforced on POSIX systems.")
+def test_failed_rows_are_counted(simulator_command):
+    population = _population(np.array([[1.0, 2.0], [-2.0, 2.0], [3.0, 1.0], [-3.0, 0.0], [-4.0, 1.0]]))
+    fitness_fun = SubprocessFitnessFunction(simulator_command, nr_of_processes=2, timeout=0.2)
+
+    with SerialEvaluator() as evaluator:
+        population.update_fitness_values(fitness_fun, evaluator, penalty_fitness=100.0)
+        failure_counts = evaluator.failure_counts()
+
+    # Rows of the batch answered before a failure are kept, the simulator still answers after them
+    np.testing.assert_allclose(population.fitness_values, [3.0, 100.0, 4.0, 100.0, 100.0])
+    assert failure_counts == {"errors": 2, "timeouts": 1, "worker_crashes": 0}
+    assert fitness_fun.eval([2.0, 2.0]) == 4.0
+
+    with pytest.raises(RowEvaluationError) as error:
+        fitness_fun.eval([-4.0, 1.0])
+    assert error.value.nr_of_errors == 1
+    fitness_fun.close()